@@ -0,0 +1,31 @@
+from django.db import migrations
+
+# Partial on is_active so the ANN index only covers the embeddings semantic search ranks.
+HNSW_INDEX_NAME = "ai_taskembedding_embedding_hnsw"
+
+
+def create_hnsw_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {HNSW_INDEX_NAME} "
+        "ON ai_taskembedding USING hnsw (embedding vector_cosine_ops) WHERE is_active"
+    )
+
+
+def drop_hnsw_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("ai", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_hnsw_index, drop_hnsw_index),
+    ]
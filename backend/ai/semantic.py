@@ -1,8 +1,23 @@
 import os
+import re
 from difflib import SequenceMatcher
 
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, When
+from pgvector.django import CosineDistance
+
+from ai.factory import get_provider
+from ai.models import TaskEmbedding
 from tasks.models import Task
 
+DEDUPE_CANDIDATE_LIMIT = 25
+DEDUPE_MIN_TRIGRAM_SIMILARITY = 0.3
+SIFT3_MAX_OFFSET = 5
+TITLE_TOKEN_SPLIT_RE = re.compile(r"\W+")
+SEMANTIC_SEARCH_LIMIT = 50
+SEMANTIC_EMBEDDING_MODEL = "default-embed"
+
 
 def semantic_search_with_fallback(queryset, query: str, semantic_requested: bool):
     if not semantic_requested:
@@ -13,15 +28,112 @@ def semantic_search_with_fallback(queryset, query: str, semantic_requested: bool
         fallback = queryset.filter(title__icontains=query) | queryset.filter(description__icontains=query)
         return fallback.distinct(), False, "ai_mode_off"
 
+    ranked_task_ids = _nearest_task_ids(queryset, query)
+    if ranked_task_ids:
+        ranking = Case(
+            *[When(id=task_id, then=rank) for rank, task_id in enumerate(ranked_task_ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(id__in=ranked_task_ids).order_by(ranking), True, None
+
     # Placeholder semantic behavior for now: still use text matching and mark as used.
     matched = queryset.filter(title__icontains=query) | queryset.filter(description__icontains=query)
     return matched.distinct(), True, None
 
 
-def dedupe_candidates(title: str, candidates: list[Task], threshold: float = 0.92):
+def _nearest_task_ids(queryset, query: str, limit: int = SEMANTIC_SEARCH_LIMIT):
+    if connection.vendor != "postgresql":
+        return []
+    provider = get_provider()
+    if provider is None:
+        return []
+    query_vector = provider.generate_embedding(text=query, model=SEMANTIC_EMBEDDING_MODEL).vector
+    if len(query_vector) != TaskEmbedding._meta.get_field("embedding").dimensions:
+        return []
+
+    # Ordered by cosine distance so the partial HNSW index answers the top-K probe in SQL.
+    return list(
+        TaskEmbedding.objects.filter(
+            is_active=True,
+            model_name=SEMANTIC_EMBEDDING_MODEL,
+            task_id__in=queryset.values("id"),
+        )
+        .order_by(CosineDistance("embedding", query_vector))
+        .values_list("task_id", flat=True)[:limit]
+    )
+
+
+def dedupe_candidate_tasks(queryset, title: str, limit: int = DEDUPE_CANDIDATE_LIMIT):
+    queryset = queryset.only("id", "title")
+    if connection.vendor != "postgresql" or not title:
+        return list(queryset[:limit])
+
+    # The % operator is answered by the gin_trgm_ops index on title, so only its matches are scored and
+    # sorted. It compares against pg_trgm.similarity_threshold, set for this transaction only.
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+            [str(DEDUPE_MIN_TRIGRAM_SIMILARITY)],
+        )
+        return list(
+            queryset.filter(title__trigram_similar=title)
+            .annotate(title_similarity=TrigramSimilarity("title", title))
+            .order_by("-title_similarity")[:limit]
+        )
+
+
+def _normalize_title_tokens(value: str) -> str:
+    return " ".join(sorted(token for token in TITLE_TOKEN_SPLIT_RE.split(value.lower()) if token))
+
+
+def _sift3_distance(left: str, right: str, max_offset: int = SIFT3_MAX_OFFSET) -> float:
+    if not left:
+        return len(right)
+    if not right:
+        return len(left)
+
+    cursor = left_offset = right_offset = common = 0
+    while cursor + left_offset < len(left) and cursor + right_offset < len(right):
+        if left[cursor + left_offset] == right[cursor + right_offset]:
+            common += 1
+        else:
+            left_offset = right_offset = 0
+            for step in range(max_offset):
+                if cursor + step < len(left) and left[cursor + step] == right[cursor]:
+                    left_offset = step
+                    common += 1
+                    break
+                if cursor + step < len(right) and left[cursor] == right[cursor + step]:
+                    right_offset = step
+                    common += 1
+                    break
+        cursor += 1
+    return (len(left) + len(right)) / 2 - common
+
+
+def title_similarity(left: str, right: str, *, exact: bool = False) -> float:
+    if exact:
+        return SequenceMatcher(None, left.lower(), right.lower()).ratio()
+
+    left = _normalize_title_tokens(left)
+    right = _normalize_title_tokens(right)
+    longest = max(len(left), len(right))
+    if longest == 0:
+        return 1.0
+    return max(0.0, 1.0 - _sift3_distance(left, right) / longest)
+
+
+def dedupe_candidates(title: str, candidates: list[Task], threshold: float = 0.92, *, exact: bool = False):
+    normalized_length = len(_normalize_title_tokens(title))
     matches = []
     for candidate in candidates:
-        ratio = SequenceMatcher(None, title.lower(), candidate.title.lower()).ratio()
+        if not exact:
+            # Sift3 distance is at least half the length gap, so skip pairs that cannot reach the threshold.
+            candidate_length = len(_normalize_title_tokens(candidate.title))
+            longest = max(normalized_length, candidate_length)
+            if longest and 1.0 - abs(normalized_length - candidate_length) / (2 * longest) < threshold:
+                continue
+        ratio = title_similarity(title, candidate.title, exact=exact)
         if ratio >= threshold:
             matches.append({"task_id": str(candidate.id), "score": ratio})
     return matches
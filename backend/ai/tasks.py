@@ -4,6 +4,7 @@ from celery import shared_task
 
 from ai.factory import get_provider
 from ai.models import ReviewSummary
+from ai.semantic import dedupe_candidate_tasks, dedupe_candidates
 from django.utils import timezone
 from tasks.models import Task
 
@@ -28,7 +29,18 @@ def embed_task(task_id: str):
 
 @shared_task(name="ai.dedupe_check")
 def dedupe_check(task_id: str):
-    return {"status": "ok", "task_id": task_id}
+    task = Task.objects.filter(id=task_id).only("id", "organization_id", "title").first()
+    if task is None:
+        return {"status": "skipped", "reason": "task_missing"}
+
+    candidates = dedupe_candidate_tasks(
+        Task.objects.filter(organization_id=task.organization_id).exclude(id=task.id),
+        task.title,
+    )
+    matches = dedupe_candidates(task.title, candidates)
+    # Derived data only; skip save() so no task change event is emitted.
+    Task.objects.filter(id=task.id).update(duplicate_candidates=matches)
+    return {"status": "ok", "task_id": task_id, "duplicate_candidates": len(matches)}
 
 
 @shared_task(name="ai.weekly_review")
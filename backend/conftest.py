@@ -0,0 +1,64 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+from django.apps import apps
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.test import override_settings
+
+BACKEND_DIR = Path(__file__).resolve().parent
+# One stamp per test database: --reuse-db keeps test_<name> for serial runs and test_<name>_gwN per
+# xdist worker, and each must be rebuilt on its own schema change.
+SCHEMA_STAMP = BACKEND_DIR / ".pytest_cache" / f"django-db-schema-{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+SCHEMA_HASH_KEY = pytest.StashKey[str]()
+# Created by VectorExtension/TrigramExtension in the migrations, which --nomigrations never runs.
+POSTGRES_EXTENSIONS = ("vector", "pg_trgm")
+
+
+def _schema_hash() -> str:
+    digest = hashlib.sha256()
+    for path in sorted(BACKEND_DIR.glob("*/models.py")) + sorted(BACKEND_DIR.glob("*/migrations/*.py")):
+        digest.update(str(path.relative_to(BACKEND_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def pytest_configure(config):
+    # --reuse-db keeps the test database between runs; rebuild it whenever models or migrations change.
+    schema_hash = config.stash[SCHEMA_HASH_KEY] = _schema_hash()
+    stamp = SCHEMA_STAMP.read_text() if SCHEMA_STAMP.exists() else ""
+    if stamp != schema_hash:
+        config.option.create_db = True
+
+
+def _create_postgres_extensions(using, **kwargs):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for extension in POSTGRES_EXTENSIONS:
+            cursor.execute(f"CREATE EXTENSION IF NOT EXISTS {extension}")
+
+
+@pytest.fixture(scope="session")
+def _postgres_extensions():
+    # pre_migrate fires for every app before the tables are synced; one sender is enough.
+    sender = apps.get_app_config("ai")
+    pre_migrate.connect(_create_postgres_extensions, sender=sender)
+    yield
+    pre_migrate.disconnect(_create_postgres_extensions, sender=sender)
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(_postgres_extensions, django_db_setup, request):
+    SCHEMA_STAMP.parent.mkdir(exist_ok=True)
+    SCHEMA_STAMP.write_text(request.config.stash[SCHEMA_HASH_KEY])
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_password_hashers():
+    # PBKDF2 dominates user setup in every app's tests; no test asserts on the hasher itself.
+    with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+        yield
@@ -1,6 +1,10 @@
 import base64
+import json
 import os
+import re
 import secrets
+from email.parser import BytesParser
+from email.policy import HTTP
 from urllib.parse import urlencode
 
 import requests
@@ -19,6 +23,10 @@ GOOGLE_OAUTH_AUTHORIZE_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 GMAIL_MESSAGES_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages"
+GMAIL_BATCH_URL = "https://www.googleapis.com/batch/gmail/v1"
+GMAIL_BATCH_PATH = "/gmail/v1/users/me/messages"
+GMAIL_BATCH_LIMIT = 100
+GMAIL_BATCH_BOUNDARY = "taskhub_gmail_batch"
 GMAIL_SCOPE = "https://www.googleapis.com/auth/gmail.modify"
 STATE_SALT = "taskhub-gmail-oauth-state"
 
@@ -271,26 +279,24 @@ def gmail_oauth_sync_view(request):
         )
 
     messages = list_response.json().get("messages") or []
+    processed_ids = [str(message.get("id") or "").strip() for message in messages]
+    processed_ids = [message_id for message_id in processed_ids if message_id]
     created_count = 0
     failed = []
-    processed_ids = []
-    for message in messages:
-        message_id = str(message.get("id") or "").strip()
-        if not message_id:
-            continue
-        processed_ids.append(message_id)
+    try:
+        raw_payloads = _fetch_raw_messages(access_token, processed_ids)
+        fetch_error = "failed to fetch message raw"
+    except requests.RequestException as exc:
+        raw_payloads = {}
+        fetch_error = f"gmail request failed: {exc}"
+    for message_id in processed_ids:
         try:
-            raw_response = requests.get(
-                f"{GMAIL_MESSAGES_URL}/{message_id}",
-                headers={"Authorization": f"Bearer {access_token}"},
-                params={"format": "raw"},
-                timeout=20,
-            )
-            if raw_response.status_code >= 400:
-                failed.append({"id": message_id, "message": "failed to fetch message raw"})
+            raw_payload = raw_payloads.get(message_id)
+            if raw_payload is None:
+                failed.append({"id": message_id, "message": fetch_error})
                 continue
 
-            raw_value = str((raw_response.json() or {}).get("raw") or "").strip()
+            raw_value = str(raw_payload.get("raw") or "").strip()
             if not raw_value:
                 failed.append({"id": message_id, "message": "message raw payload missing"})
                 continue
@@ -334,6 +340,55 @@ def _google_oauth_config():
     return client_id, client_secret, redirect_uri
 
 
+def _fetch_raw_messages(access_token: str, message_ids: list[str]) -> dict[str, dict]:
+    # One multipart/mixed batch request per GMAIL_BATCH_LIMIT ids instead of a GET per message.
+    # Ids whose part failed are left out of the result.
+    payloads = {}
+    for offset in range(0, len(message_ids), GMAIL_BATCH_LIMIT):
+        chunk = message_ids[offset : offset + GMAIL_BATCH_LIMIT]
+        body = "".join(
+            f"--{GMAIL_BATCH_BOUNDARY}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <{message_id}>\r\n\r\n"
+            f"GET {GMAIL_BATCH_PATH}/{message_id}?format=raw\r\n\r\n"
+            for message_id in chunk
+        )
+        response = requests.post(
+            GMAIL_BATCH_URL,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": f"multipart/mixed; boundary={GMAIL_BATCH_BOUNDARY}",
+            },
+            data=f"{body}--{GMAIL_BATCH_BOUNDARY}--\r\n".encode("utf-8"),
+            timeout=20,
+        )
+        if response.status_code >= 400:
+            continue
+        payloads.update(_parse_batch_response(response.headers.get("Content-Type", ""), response.content))
+    return payloads
+
+
+def _parse_batch_response(content_type: str, content: bytes) -> dict[str, dict]:
+    envelope = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + content)
+    if not envelope.is_multipart():
+        return {}
+    payloads = {}
+    for part in envelope.iter_parts():
+        # Google echoes each request's Content-ID back as "response-<id>".
+        message_id = str(part.get("Content-ID") or "").strip().strip("<>").removeprefix("response-")
+        http_response = part.get_payload(decode=True) or b""
+        status_line, _, rest = http_response.partition(b"\n")
+        status_parts = status_line.split()
+        if not message_id or len(status_parts) < 2 or not status_parts[1].isdigit() or int(status_parts[1]) >= 400:
+            continue
+        json_body = re.split(rb"\r?\n\r?\n", rest, maxsplit=1)[-1].strip()
+        try:
+            payloads[message_id] = json.loads(json_body) or {}
+        except ValueError:
+            continue
+    return payloads
+
+
 def _refresh_google_access_token(refresh_token: str) -> str:
     client_id, client_secret, _redirect_uri = _google_oauth_config()
     response = requests.post(
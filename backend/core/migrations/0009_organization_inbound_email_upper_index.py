@@ -0,0 +1,15 @@
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_organization_hash_inbound_ingest_tokens"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="organization",
+            index=models.Index(Upper("inbound_email_address"), name="core_org_inbound_email_upper"),
+        ),
+    ]
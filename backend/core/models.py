@@ -2,6 +2,7 @@ import uuid
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Upper
 
 from core.crypto import decrypt_secret, encrypt_secret
 from .managers import UserManager
@@ -37,6 +38,12 @@ class Organization(models.Model):
     imap_mark_seen_on_success = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Matches the UPPER(...) = UPPER(...) form Django emits for inbound_email_address__iexact.
+            models.Index(Upper("inbound_email_address"), name="core_org_inbound_email_upper"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import csv
+import random
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
 from core.models import User
 from mobile_api.models import OIDCIdentity
 
+BACKFILL_CHUNK_SIZE = 5000
+BULK_BATCH_SIZE = 1000
+CSV_READ_BUFFER = 1 << 20
+REPORT_SAMPLE_SIZE = 100
+
 
 @dataclass
 class IdentityMappingRow:
@@ -15,56 +28,143 @@ class IdentityMappingRow:
     issuer: str
 
 
-def load_identity_mapping_csv(path: str | Path, *, default_issuer: str) -> list[IdentityMappingRow]:
-    rows: list[IdentityMappingRow] = []
-    with Path(path).open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
+def iter_identity_mapping_csv(path: str | Path, *, default_issuer: str) -> Iterator[IdentityMappingRow]:
+    with Path(path).open("r", encoding="utf-8", newline="", buffering=CSV_READ_BUFFER) as handle:
+        # Plain csv.reader with column positions resolved once; DictReader builds a dict per row.
+        reader = csv.reader(handle)
+        columns = {name: index for index, name in enumerate(next(reader, []))}
+        email_at = columns.get("email")
+        subject_at = columns.get("subject")
+        if email_at is None or subject_at is None:
+            return
+        issuer_at = columns.get("issuer", -1)
+
         for row in reader:
-            email = str(row.get("email") or "").strip().lower()
-            subject = str(row.get("subject") or "").strip()
-            issuer = str(row.get("issuer") or default_issuer).strip()
+            size = len(row)
+            email = row[email_at].strip().lower() if email_at < size else ""
+            subject = row[subject_at].strip() if subject_at < size else ""
+            issuer = ((row[issuer_at] if 0 <= issuer_at < size else "") or default_issuer).strip()
             if not email or not subject or not issuer:
                 continue
-            rows.append(IdentityMappingRow(email=email, subject=subject, issuer=issuer))
-    return rows
+            yield IdentityMappingRow(email=email, subject=subject, issuer=issuer)
+
+
+def load_identity_mapping_csv(path: str | Path, *, default_issuer: str) -> list[IdentityMappingRow]:
+    return list(iter_identity_mapping_csv(path, default_issuer=default_issuer))
 
 
-def backfill_oidc_identities(rows: list[IdentityMappingRow], *, dry_run: bool = True) -> dict:
+def backfill_oidc_identities(
+    rows: Iterable[IdentityMappingRow],
+    *,
+    dry_run: bool = True,
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+) -> dict:
     report = {
-        "total_rows": len(rows),
+        "total_rows": 0,
         "created": 0,
         "updated": 0,
         "unchanged": 0,
+        "missing_user_count": 0,
+        "invalid_row_count": 0,
         "missing_users": [],
         "invalid_rows": [],
     }
 
+    # Consume the rows a chunk at a time so a streamed CSV never has to fit in memory.
+    iterator = iter(rows)
+    with nullcontext() if dry_run else transaction.atomic():
+        if not dry_run and connection.vendor == "postgresql":
+            # One commit for the whole run; a crash before it leaves nothing applied, and the run can be repeated.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = OFF")
+        while chunk := list(islice(iterator, chunk_size)):
+            report["total_rows"] += len(chunk)
+            _backfill_chunk(chunk, report, dry_run=dry_run)
+
+    return report
+
+
+def _sample_row(sample: list[dict], seen: int, row_info: dict) -> None:
+    # Reservoir sampling keeps the report a fixed size however many rows are missing or invalid.
+    if len(sample) < REPORT_SAMPLE_SIZE:
+        sample.append(row_info)
+    elif random.random() < REPORT_SAMPLE_SIZE / seen:
+        sample[random.randrange(REPORT_SAMPLE_SIZE)] = row_info
+
+
+def _backfill_chunk(rows: list[IdentityMappingRow], report: dict, *, dry_run: bool) -> None:
+    # Values without an "@" can never match a user; report them without sending them to the database.
+    # Anything else (e.g. dotless domains like admin@localhost) is left to the user lookup.
+    valid_rows = []
+    for row in rows:
+        if "@" not in row.email:
+            report["invalid_row_count"] += 1
+            _sample_row(
+                report["invalid_rows"],
+                report["invalid_row_count"],
+                {"email": row.email, "subject": row.subject, "reason": "invalid_email"},
+            )
+        else:
+            valid_rows.append(row)
+    rows = valid_rows
+
+    # Two lookups per chunk instead of two per row; rows are still diffed in file order.
+    user_ids: dict[str, int] = {}
+    for user_id, email_lower in (
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in={row.email for row in rows})
+        .order_by("pk")
+        .values_list("id", "email_lower")
+    ):
+        user_ids.setdefault(email_lower, user_id)
+
+    keys = {(row.issuer, row.subject) for row in rows}
+    identities = {
+        (identity.issuer, identity.subject): identity
+        for identity in OIDCIdentity.objects.filter(subject__in={subject for _, subject in keys}).only(
+            "id", "issuer", "subject", "user_id"
+        )
+        if (identity.issuer, identity.subject) in keys
+    }
+
+    to_create: dict[tuple[str, str], OIDCIdentity] = {}
+    to_update: dict[tuple[str, str], OIDCIdentity] = {}
     for row in rows:
-        user = User.objects.filter(email__iexact=row.email).first()
-        if user is None:
-            report["missing_users"].append({"email": row.email, "subject": row.subject})
+        user_id = user_ids.get(row.email)
+        if user_id is None:
+            report["missing_user_count"] += 1
+            _sample_row(report["missing_users"], report["missing_user_count"], {"email": row.email, "subject": row.subject})
             continue
 
-        existing = OIDCIdentity.objects.filter(issuer=row.issuer, subject=row.subject).first()
-        if existing is not None and existing.user_id == user.id:
+        key = (row.issuer, row.subject)
+        identity = identities.get(key)
+        if identity is not None and identity.user_id == user_id:
             report["unchanged"] += 1
             continue
 
-        if dry_run:
-            if existing is None:
-                report["created"] += 1
-            else:
-                report["updated"] += 1
-            continue
-
-        identity, created = OIDCIdentity.objects.update_or_create(
-            issuer=row.issuer,
-            subject=row.subject,
-            defaults={"user": user},
-        )
-        if created:
+        if identity is None:
+            identity = identities[key] = to_create[key] = OIDCIdentity(
+                issuer=row.issuer, subject=row.subject, user_id=user_id
+            )
             report["created"] += 1
-        elif identity.user_id == user.id:
+        else:
+            identity.user_id = user_id
+            if key not in to_create:
+                to_update[key] = identity
             report["updated"] += 1
 
-    return report
+    if dry_run:
+        return
+
+    now = timezone.now()
+    for identity in to_update.values():
+        identity.last_seen_at = now
+    OIDCIdentity.objects.bulk_update(to_update.values(), ["user", "last_seen_at"], batch_size=BULK_BATCH_SIZE)
+    # A concurrent login may have linked the same (issuer, subject) since the lookup; take the mapping's user.
+    OIDCIdentity.objects.bulk_create(
+        to_create.values(),
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["issuer", "subject"],
+        update_fields=["user"],
+    )
@@ -1,7 +1,14 @@
 import pytest
+from django.db import connection
 
 from core.models import Organization, User
-from mobile_api.backfill import backfill_oidc_identities, load_identity_mapping_csv
+from mobile_api.backfill import (
+    REPORT_SAMPLE_SIZE,
+    IdentityMappingRow,
+    backfill_oidc_identities,
+    iter_identity_mapping_csv,
+    load_identity_mapping_csv,
+)
 from mobile_api.models import OIDCIdentity
 
 
@@ -28,3 +35,78 @@ def test_identity_backfill_dry_run_and_apply(tmp_path):
     assert report_apply["created"] == 1
     identity = OIDCIdentity.objects.get(issuer="https://tasks.example.com/idp/realms/taskhub", subject="sub-1")
     assert identity.user_id == user.id
+
+
+@pytest.mark.django_db
+def test_identity_backfill_streams_csv_rows_in_chunks(tmp_path):
+    org = Organization.objects.create(name="Org")
+    User.objects.create_user(email="first@example.com", password="StrongPass123!", organization=org)
+    User.objects.create_user(email="second@example.com", password="StrongPass123!", organization=org)
+    User.objects.create_user(email="admin@localhost", password="StrongPass123!", organization=org)
+
+    csv_path = tmp_path / "identity-map.csv"
+    csv_path.write_text(
+        "email,subject\n"
+        "first@example.com,sub-1\n"
+        "second@example.com,sub-2\n"
+        "missing@example.com,sub-3\n"
+        "not-an-email,sub-4\n"
+        "admin@localhost,sub-5\n",
+        encoding="utf-8",
+    )
+
+    rows = iter_identity_mapping_csv(csv_path, default_issuer="https://tasks.example.com/idp/realms/taskhub")
+    report = backfill_oidc_identities(rows, dry_run=False, chunk_size=2)
+    assert report["total_rows"] == 5
+    assert report["created"] == 3
+    assert report["missing_users"] == [{"email": "missing@example.com", "subject": "sub-3"}]
+    assert report["invalid_rows"] == [{"email": "not-an-email", "subject": "sub-4", "reason": "invalid_email"}]
+    assert (report["missing_user_count"], report["invalid_row_count"]) == (1, 1)
+    assert OIDCIdentity.objects.filter(issuer="https://tasks.example.com/idp/realms/taskhub").count() == 3
+    assert OIDCIdentity.objects.get(subject="sub-5").user.email == "admin@localhost"
+
+
+@pytest.mark.django_db
+def test_identity_backfill_relinks_identities_in_bulk(django_assert_num_queries):
+    issuer = "https://tasks.example.com/idp/realms/taskhub"
+    org = Organization.objects.create(name="Org")
+    old_owner, new_owner = User.objects.bulk_create(
+        [User(email="old@example.com", organization=org), User(email="New@Example.com", organization=org)]
+    )
+    OIDCIdentity.objects.bulk_create(
+        [
+            OIDCIdentity(issuer=issuer, subject="sub-moved", user=old_owner),
+            OIDCIdentity(issuer=issuer, subject="sub-kept", user=old_owner),
+        ]
+    )
+    rows = [
+        IdentityMappingRow(email="new@example.com", subject="sub-moved", issuer=issuer),
+        IdentityMappingRow(email="old@example.com", subject="sub-kept", issuer=issuer),
+        IdentityMappingRow(email="new@example.com", subject="sub-new", issuer=issuer),
+    ]
+
+    # User lookup, identity lookup, one UPDATE and one upserting INSERT for the whole chunk, inside the
+    # run's atomic block (a savepoint pair here, since the test already holds a transaction). PostgreSQL
+    # also records the SET LOCAL synchronous_commit statement.
+    with django_assert_num_queries(6 + (connection.vendor == "postgresql")):
+        report = backfill_oidc_identities(rows, dry_run=False)
+    assert (report["created"], report["updated"], report["unchanged"]) == (1, 1, 1)
+    assert dict(OIDCIdentity.objects.values_list("subject", "user_id")) == {
+        "sub-moved": new_owner.id,
+        "sub-kept": old_owner.id,
+        "sub-new": new_owner.id,
+    }
+
+
+@pytest.mark.django_db
+def test_identity_backfill_report_samples_missing_users():
+    issuer = "https://tasks.example.com/idp/realms/taskhub"
+    rows = [
+        IdentityMappingRow(email=f"missing-{index}@example.com", subject=f"sub-{index}", issuer=issuer)
+        for index in range(REPORT_SAMPLE_SIZE * 3)
+    ]
+
+    report = backfill_oidc_identities(rows, dry_run=True, chunk_size=REPORT_SAMPLE_SIZE)
+    assert report["missing_user_count"] == REPORT_SAMPLE_SIZE * 3
+    assert len(report["missing_users"]) == REPORT_SAMPLE_SIZE
+    assert {entry["email"] for entry in report["missing_users"]} <= {row.email for row in rows}
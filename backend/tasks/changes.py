@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django.db.models import Count, Max
+
+from tasks.models import Task
+
+
+def change_cursor(organization_id) -> str:
+    # Any create, update or delete moves either the row count or the newest updated_at.
+    aggregated = Task.objects.filter(organization_id=organization_id).aggregate(
+        total=Count("id"), latest_updated=Max("updated_at")
+    )
+    latest_updated = aggregated["latest_updated"]
+    latest_epoch = f"{latest_updated.timestamp():.6f}" if latest_updated else "0"
+    return f'{aggregated["total"]}:{latest_epoch}'
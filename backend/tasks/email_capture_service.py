@@ -6,7 +6,6 @@ from uuid import uuid4
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db import IntegrityError
-from django.db.models import Max
 from django.utils.text import get_valid_filename
 
 from core.models import Organization, User
@@ -23,6 +22,7 @@ from tasks.email_ingest import (
     parse_task_metadata,
 )
 from tasks.models import Project, Task
+from tasks.ordering import next_task_position
 
 SCRIPT_TAG_RE = re.compile(r"(?is)<script\b[^>]*>.*?</script>")
 EVENT_HANDLER_ATTR_RE = re.compile(r"""(?is)\s+on[a-z0-9_-]+\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)""")
@@ -52,14 +52,16 @@ def ingest_raw_email_for_org(
     priority_override=None,
     source_external_id: str = "",
     source_origin: str = "",
+    parsed=None,
 ):
     if not raw_eml:
         raise EmailIngestError(400, "validation_error", "an .eml payload is required")
 
-    try:
-        parsed = parse_eml(raw_eml)
-    except Exception as exc:
-        raise EmailIngestError(400, "validation_error", "invalid .eml payload") from exc
+    if parsed is None:
+        try:
+            parsed = parse_eml(raw_eml)
+        except Exception as exc:
+            raise EmailIngestError(400, "validation_error", "invalid .eml payload") from exc
 
     sender = str(sender_override or extract_sender(parsed) or "").strip().lower()
     whitelist = {
@@ -136,9 +138,7 @@ def ingest_raw_email_for_org(
         create_if_missing=create_project_if_missing,
     )
 
-    next_position = (
-        Task.objects.filter(organization=organization).aggregate(max_position=Max("position"))["max_position"] or 0
-    ) + 1
+    next_position = next_task_position(organization.id)
 
     task = Task.objects.create(
         organization=organization,
@@ -40,8 +40,8 @@ def sync_inbound_imap(organization: Organization, max_messages: int = 25) -> dic
             message_label = message_id.decode("utf-8", errors="ignore") or str(message_id)
             try:
                 raw_eml = _fetch_message_raw(mailbox, message_id)
-                parse_eml(raw_eml)
-                ingest_raw_email_for_org(organization, raw_eml)
+                parsed = parse_eml(raw_eml)
+                ingest_raw_email_for_org(organization, raw_eml, parsed=parsed)
                 created += 1
                 if config["mark_seen_on_success"]:
                     mailbox.store(message_id, "+FLAGS", "\\Seen")
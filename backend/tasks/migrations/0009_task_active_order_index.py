@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0008_task_text_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["organization", "position", "-created_at"],
+                condition=~models.Q(status="archived"),
+                name="tasks_task_active_order_idx",
+            ),
+        ),
+    ]
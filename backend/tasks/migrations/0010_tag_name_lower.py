@@ -0,0 +1,22 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0009_task_active_order_index"),
+    ]
+
+    # Generated by the database, so existing rows are filled in when the column is added.
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="name_lower",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=Lower("name"),
+                output_field=models.CharField(max_length=255),
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0010_tag_name_lower"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="duplicate_candidates",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
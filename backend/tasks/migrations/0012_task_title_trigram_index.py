@@ -0,0 +1,31 @@
+from django.db import migrations
+
+# Plain (not UPPER()) title trigram index for the duplicate check's ``title % %s`` filter; the
+# 0008 indexes only serve the icontains search expression.
+INDEX_NAME = "tasks_task_title_trgm"
+
+
+def create_title_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON tasks_task USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_title_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0011_task_duplicate_candidates"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_trigram_index, drop_title_trigram_index),
+    ]
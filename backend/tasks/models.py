@@ -34,6 +34,14 @@ class Tag(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="tags")
     name = models.CharField(max_length=255)
+    # Case-folded copy of name so tag filters are a plain indexed equality. Maintained by the database,
+    # so raw writes (loaddata restores, bulk_create/update) can't leave it stale.
+    name_lower = models.GeneratedField(
+        expression=Lower("name"),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+        db_index=True,
+    )
     color = models.CharField(max_length=32, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -46,6 +54,10 @@ class Tag(models.Model):
             )
         ]
 
+    def save(self, *args, **kwargs):
+        self.name = self.name.strip()
+        super().save(*args, **kwargs)
+
 
 class Task(models.Model):
     class Intent(models.TextChoices):
@@ -93,6 +105,8 @@ class Task(models.Model):
     description = models.TextField(blank=True)
     notes = models.TextField(blank=True)
     attachments = models.JSONField(default=list, blank=True)
+    # Filled in after creation by the ai.dedupe_check worker task.
+    duplicate_candidates = models.JSONField(default=list, blank=True)
     intent = models.CharField(max_length=20, choices=Intent.choices, default=Intent.TASK)
     area = models.CharField(max_length=20, choices=Area.choices)
     project = models.ForeignKey(
@@ -122,6 +136,12 @@ class Task(models.Model):
             models.Index(fields=["organization", "status"]),
             models.Index(fields=["organization", "project"]),
             models.Index(fields=["organization", "position"], name="tasks_task_organiz_81029d_idx"),
+            # Matches the default board ordering; archived rows never appear outside history.
+            models.Index(
+                fields=["organization", "position", "-created_at"],
+                condition=~Q(status="archived"),
+                name="tasks_task_active_order_idx",
+            ),
         ]
         constraints = [
             models.CheckConstraint(
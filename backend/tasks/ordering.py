@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from tasks.models import Task
+
+POSITION_GAP = 1024
+
+
+def next_task_position(organization_id) -> int:
+    # Served by a backward scan of the (organization, position) index; no aggregate needed. New tasks
+    # leave a full gap so reordering them later finds room without a respace.
+    last_position = (
+        Task.objects.filter(organization_id=organization_id)
+        .order_by("-position")
+        .values_list("position", flat=True)
+        .first()
+    )
+    return (last_position or 0) + POSITION_GAP
+
+
+def position_between(lower: int | None, upper: int | None) -> int | None:
+    if lower is None and upper is None:
+        return POSITION_GAP
+    if lower is None:
+        if upper > POSITION_GAP:
+            return upper - POSITION_GAP
+        if upper > 0:
+            return upper // 2
+        return None
+    if upper is None:
+        return lower + POSITION_GAP
+    if upper - lower >= 2:
+        return lower + (upper - lower) // 2
+    return None
+
+
+def spaced_positions(ordered_ids):
+    return {task_id: index * POSITION_GAP for index, task_id in enumerate(ordered_ids, start=1)}
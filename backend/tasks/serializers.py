@@ -2,7 +2,6 @@ from uuid import UUID
 
 from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from django.db.models import Max
 from django.utils import timezone
 
 from core.models import User
@@ -13,10 +12,32 @@ from tasks.attachments import (
     path_matches_task,
 )
 from tasks.models import Project, Tag, Task
+from tasks.ordering import next_task_position
 from tasks.recurrence import next_due_at_for_completion
 from tasks.transitions import is_valid_transition
 
 
+def represent_task_attachments(raw_attachments) -> list[dict]:
+    attachments = []
+    for item in raw_attachments or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            normalized_item = normalize_attachment_input(item)
+        except ValueError:
+            continue
+        normalized_name = str(normalized_item["name"] or "").strip() or "Attachment"
+        normalized_path = str(normalized_item["path"] or "").strip()
+        attachments.append(
+            {
+                "name": normalized_name,
+                "path": normalized_path,
+                "url": build_attachment_access_url(normalized_path),
+            }
+        )
+    return attachments
+
+
 class TaskSerializer(serializers.ModelSerializer):
     tag_ids = serializers.PrimaryKeyRelatedField(
         many=True,
@@ -53,6 +74,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "tag_ids",
             "allow_cloud_processing",
             "position",
+            "duplicate_candidates",
         ]
         read_only_fields = [
             "id",
@@ -63,6 +85,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "completed_at",
             "position",
             "source_external_id",
+            "duplicate_candidates",
         ]
 
     def _project_name_from_payload(self) -> str | None:
@@ -226,12 +249,7 @@ class TaskSerializer(serializers.ModelSerializer):
                 area=validated_data.get("area"),
             )
         user = self.context["request"].user
-        next_position = (
-            Task.objects.filter(organization=user.organization).aggregate(max_position=Max("position"))[
-                "max_position"
-            ]
-            or 0
-        ) + 1
+        next_position = next_task_position(user.organization_id)
         task = Task.objects.create(
             organization=user.organization,
             created_by_user=user,
@@ -279,12 +297,7 @@ class TaskSerializer(serializers.ModelSerializer):
         if next_due_at is None:
             return
 
-        next_position = (
-            Task.objects.filter(organization=instance.organization).aggregate(max_position=Max("position"))[
-                "max_position"
-            ]
-            or 0
-        ) + 1
+        next_position = next_task_position(instance.organization_id)
         next_task = Task.objects.create(
             organization=instance.organization,
             created_by_user=instance.created_by_user,
@@ -307,27 +320,19 @@ class TaskSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        attachments = []
-        for item in instance.attachments or []:
-            if not isinstance(item, dict):
-                continue
-            try:
-                normalized_item = normalize_attachment_input(item)
-            except ValueError:
-                continue
-            normalized_name = str(normalized_item["name"] or "").strip() or "Attachment"
-            normalized_path = str(normalized_item["path"] or "").strip()
-            attachments.append(
-                {
-                    "name": normalized_name,
-                    "path": normalized_path,
-                    "url": build_attachment_access_url(normalized_path),
-                }
-            )
-        data["attachments"] = attachments
+        data["attachments"] = represent_task_attachments(instance.attachments)
         return data
 
 
+# Long free-text fields the board list never renders; detail reads still return them.
+TASK_LIST_OMITTED_FIELDS = ("description", "source_link", "source_snippet", "duplicate_candidates")
+
+
+class TaskListSerializer(TaskSerializer):
+    class Meta(TaskSerializer.Meta):
+        fields = [field for field in TaskSerializer.Meta.fields if field not in TASK_LIST_OMITTED_FIELDS]
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
@@ -338,5 +343,5 @@ class ProjectSerializer(serializers.ModelSerializer):
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
-        fields = "__all__"
+        exclude = ["name_lower"]
         read_only_fields = ["id", "organization", "created_at"]
@@ -73,6 +73,7 @@ def archive_completed_tasks(organization_id: str | None = None):
     return {
         "status": "ok",
         "archived_count": archived_count,
+        "archived_ids": [str(task_id) for task_id in archived_task_ids],
         "archive_after_days": archive_after_days,
     }
 
@@ -9,8 +9,11 @@ ALLOWED_TRANSITIONS = {
     Task.Status.ARCHIVED: {Task.Status.INBOX, Task.Status.NEXT, Task.Status.WAITING, Task.Status.SOMEDAY},
 }
 
+# Flattened (old, new) pairs so a transition check is a single hash lookup.
+ALLOWED_TRANSITION_PAIRS = frozenset(
+    (old_status, new_status) for old_status, targets in ALLOWED_TRANSITIONS.items() for new_status in targets
+)
+
 
 def is_valid_transition(old_status: str, new_status: str) -> bool:
-    if old_status == new_status:
-        return True
-    return new_status in ALLOWED_TRANSITIONS.get(old_status, set())
+    return old_status == new_status or (old_status, new_status) in ALLOWED_TRANSITION_PAIRS
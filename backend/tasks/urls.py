@@ -18,6 +18,6 @@ router.register(r"tags", TagViewSet, basename="tag")
 urlpatterns = [
     path("tasks/attachments/file", attachment_file_view),
     path("", include(router.urls)),
-    path("capture/bookmarklet", bookmarklet_capture_view),
+    path("capture/bookmarklet", bookmarklet_capture_view, name="capture_bookmarklet"),
     path("capture/email/inbound", inbound_email_capture_view),
 ]
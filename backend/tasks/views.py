@@ -1,22 +1,26 @@
 from datetime import timedelta
+import logging
 import mimetypes
 import time
 from uuid import uuid4
 
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
 from django.http import FileResponse
 from django.utils.text import get_valid_filename
-from django.db.models import Case, Count, IntegerField, Max, Q, Value, When
+from django.db.models import Case, Count, IntegerField, Prefetch, Q, Value, When, Window
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
+from rest_framework.generics import get_object_or_404
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.throttling import SimpleRateThrottle
 
-from ai.semantic import dedupe_candidates, semantic_search_with_fallback
+from ai.semantic import semantic_search_with_fallback
+from ai.tasks import dedupe_check
 from core.models import Organization
 from core.security import verify_inbound_ingest_token
 from mobile_api.notifications import (
@@ -31,6 +35,7 @@ from tasks.attachments import (
     decode_attachment_token,
     path_matches_org,
 )
+from tasks.changes import change_cursor
 from tasks.email_ingest import (
     extract_recipient,
     extract_sender,
@@ -38,9 +43,30 @@ from tasks.email_ingest import (
 )
 from tasks.email_capture_service import EmailIngestError, ingest_raw_email_for_org
 from tasks.models import Project, Tag, Task, TaskChangeEvent
-from tasks.serializers import ProjectSerializer, TagSerializer, TaskSerializer
+from tasks.ordering import next_task_position, position_between, spaced_positions
+from tasks.serializers import (
+    TASK_LIST_OMITTED_FIELDS,
+    ProjectSerializer,
+    TagSerializer,
+    TaskListSerializer,
+    TaskSerializer,
+    represent_task_attachments,
+)
 from tasks.transitions import is_valid_transition
 
+logger = logging.getLogger(__name__)
+
+REORDER_UPDATE_BATCH_SIZE = 500
+ATTACHMENT_UPLOAD_DEFERRED_FIELDS = ("description", "notes", "source_link", "source_snippet")
+TASK_SORT_ALLOWLIST = frozenset({"created_at", "updated_at", "due_at", "priority", "title", "status", "position"})
+PRIORITY_GROUP_EXPRESSION = Case(
+    When(priority__gte=4, then=Value(0)),
+    When(priority__gte=2, then=Value(1)),
+    When(priority__gte=1, then=Value(2)),
+    default=Value(3),
+    output_field=IntegerField(),
+)
+
 
 class InboundIngestRateThrottle(SimpleRateThrottle):
     scope = "inbound_email_ingest"
@@ -54,25 +80,30 @@ class InboundIngestRateThrottle(SimpleRateThrottle):
 
 class OrgScopedQuerysetMixin:
     def _org(self):
-        return self.request.user.organization
+        return self.request.user.organization_id
 
 
 class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
 
-    def _change_cursor(self):
-        aggregated = Task.objects.filter(organization=self.request.user.organization).aggregate(
-            total=Count("id"), latest_updated=Max("updated_at")
-        )
-        latest_updated = aggregated["latest_updated"]
-        latest_epoch = f"{latest_updated.timestamp():.6f}" if latest_updated else "0"
-        return f'{aggregated["total"]}:{latest_epoch}'
+    def initialize_request(self, request, *args, **kwargs):
+        drf_request = super().initialize_request(request, *args, **kwargs)
+        if self.action == "upload_attachment":
+            # Spool uploads to disk so storage can move the temp file instead of copying it from memory.
+            request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return drf_request
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TaskListSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         user = self.request.user
-        qs = Task.objects.filter(organization=user.organization).order_by("position", "-created_at")
-        include_history = self.request.query_params.get("include_history") == "true"
+        query_params = self.request.query_params
+        qs = Task.objects.filter(organization_id=user.organization_id).order_by("position", "-created_at")
+        include_history = query_params.get("include_history") == "true"
         if getattr(self, "action", None) == "list" and not include_history:
             done_cutoff = timezone.now() - timedelta(days=1)
             upcoming_cutoff = timezone.now() + timedelta(days=7)
@@ -84,15 +115,16 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
                 ~Q(status__in=[Task.Status.DONE, Task.Status.ARCHIVED]) & Q(due_at__gt=upcoming_cutoff)
             )
 
-        status_value = self.request.query_params.get("status")
-        area = self.request.query_params.get("area")
-        project_id = self.request.query_params.get("project_id")
-        tag = self.request.query_params.get("tag")
-        priority_min = self.request.query_params.get("priority_min")
-        priority_max = self.request.query_params.get("priority_max")
-        due_before = self.request.query_params.get("due_before")
-        due_after = self.request.query_params.get("due_after")
-        q = self.request.query_params.get("q")
+        status_value = query_params.get("status")
+        area = query_params.get("area")
+        project_id = query_params.get("project_id")
+        tag = query_params.get("tag")
+        priority_min = query_params.get("priority_min")
+        priority_max = query_params.get("priority_max")
+        due_before = query_params.get("due_before")
+        due_after = query_params.get("due_after")
+        q = query_params.get("q")
+        needs_distinct = False
 
         if status_value:
             qs = qs.filter(status=status_value)
@@ -101,7 +133,9 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
         if project_id:
             qs = qs.filter(project_id=project_id)
         if tag:
-            qs = qs.filter(tags__name__iexact=tag)
+            qs = qs.filter(tags__name_lower=tag.lower())
+            # Only the tag join can fan out rows; skip DISTINCT for every other filter.
+            needs_distinct = True
         if priority_min:
             qs = qs.filter(priority__gte=priority_min)
         if priority_max:
@@ -113,25 +147,16 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
         if q:
             qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q))
 
-        sort_mode = self.request.query_params.get("sort_mode")
+        sort_mode = query_params.get("sort_mode")
         if sort_mode == "priority_manual":
-            qs = qs.annotate(
-                priority_group=Case(
-                    When(priority__gte=4, then=Value(0)),
-                    When(priority__gte=2, then=Value(1)),
-                    When(priority__gte=1, then=Value(2)),
-                    default=Value(3),
-                    output_field=IntegerField(),
-                )
-            ).order_by("priority_group", "position")
+            qs = qs.annotate(priority_group=PRIORITY_GROUP_EXPRESSION).order_by("priority_group", "position")
         else:
-            sort = self.request.query_params.get("sort", "created_at")
-            order = self.request.query_params.get("order", "desc")
-            allowlist = {"created_at", "updated_at", "due_at", "priority", "title", "status", "position"}
-            if sort in allowlist:
+            sort = query_params.get("sort", "created_at")
+            order = query_params.get("order", "desc")
+            if sort in TASK_SORT_ALLOWLIST:
                 qs = qs.order_by(f"{'-' if order == 'desc' else ''}{sort}")
 
-        return qs.distinct()
+        return qs.distinct() if needs_distinct else qs
 
     def list(self, request, *args, **kwargs):
         semantic_requested = request.query_params.get("semantic") == "true"
@@ -154,35 +179,54 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
         else:
             semantic_used = False
             fallback_reason = None
+        queryset = queryset.defer(*TASK_LIST_OMITTED_FIELDS).prefetch_related(
+            Prefetch("tags", queryset=Tag.objects.only("id"))
+        )
         page = int(request.query_params.get("page", 1))
         page_size = min(int(request.query_params.get("page_size", 25)), 100)
         start = (page - 1) * page_size
         end = start + page_size
 
-        total = queryset.count()
-        serializer = self.get_serializer(queryset[start:end], many=True)
+        if request.query_params.get("with_total") == "true":
+            rows, total = self._page_with_total(queryset, start, end)
+            has_next = start + len(rows) < total
+        else:
+            # Infinite scroll only needs to know whether another page exists, so probe one extra row.
+            rows = list(queryset[start : end + 1])
+            has_next = len(rows) > page_size
+            rows = rows[:page_size]
+            total = None
+        serializer = self.get_serializer(rows, many=True)
         return Response(
             {
                 "results": serializer.data,
                 "page": page,
                 "page_size": page_size,
                 "total": total,
+                "has_next": has_next,
                 "semantic_requested": semantic_requested,
                 "semantic_used": semantic_used,
                 "fallback_reason": fallback_reason,
             }
         )
 
+    def _page_with_total(self, queryset, start, end):
+        # COUNT(*) OVER () is evaluated before DISTINCT, so de-duplicated querysets keep the two-query form.
+        if queryset.query.distinct or not connection.features.supports_over_clause:
+            return list(queryset[start:end]), queryset.count()
+
+        rows = list(queryset.annotate(list_total=Window(expression=Count("*")))[start:end])
+        if rows:
+            return rows, rows[0].list_total
+        return rows, queryset.count() if start else 0
+
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
         if response.status_code != status.HTTP_201_CREATED:
             return response
 
-        title = response.data.get("title", "")
-        candidates = Task.objects.filter(organization=request.user.organization).exclude(
-            id=response.data.get("id")
-        )[:25]
-        response.data["duplicate_candidates"] = dedupe_candidates(title, list(candidates))
+        task_id = str(response.data.get("id"))
+        transaction.on_commit(lambda: _enqueue_dedupe_check(task_id))
         return response
 
     def partial_update(self, request, *args, **kwargs):
@@ -246,7 +290,7 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
             )
 
         try:
-            target_task = Task.objects.get(id=target_task_id, organization=task.organization)
+            target_task = Task.objects.get(id=target_task_id, organization_id=task.organization_id)
         except Task.DoesNotExist:
             return Response(
                 {
@@ -261,13 +305,13 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
             return Response(self.get_serializer(task).data)
 
         with transaction.atomic():
-            ordered_ids = list(
-                Task.objects.select_for_update()
-                .filter(organization=task.organization)
-                .order_by("position", "created_at", "id")
-                .values_list("id", flat=True)
-            )
-            if task.id not in ordered_ids or target_task.id not in ordered_ids:
+            locked = {
+                row.id: row
+                for row in Task.objects.select_for_update()
+                .filter(organization_id=task.organization_id, id__in=[task.id, target_task.id])
+                .only("id", "position", "created_at")
+            }
+            if task.id not in locked or target_task.id not in locked:
                 return Response(
                     {
                         "error_code": "not_found",
@@ -277,33 +321,81 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            ordered_ids.remove(task.id)
-            target_index = ordered_ids.index(target_task.id)
-            insert_index = target_index if placement == "before" else target_index + 1
-            ordered_ids.insert(insert_index, task.id)
+            anchor = locked[target_task.id]
+            siblings = (
+                Task.objects.select_for_update()
+                .filter(organization_id=task.organization_id)
+                .exclude(id=task.id)
+                .only("id", "position")
+            )
+            same_position = Q(position=anchor.position)
+            if placement == "before":
+                neighbor = (
+                    siblings.filter(
+                        Q(position__lt=anchor.position)
+                        | (same_position & Q(created_at__lt=anchor.created_at))
+                        | (same_position & Q(created_at=anchor.created_at, id__lt=anchor.id))
+                    )
+                    .order_by("-position", "-created_at", "-id")
+                    .first()
+                )
+                new_position = position_between(neighbor.position if neighbor else None, anchor.position)
+            else:
+                neighbor = (
+                    siblings.filter(
+                        Q(position__gt=anchor.position)
+                        | (same_position & Q(created_at__gt=anchor.created_at))
+                        | (same_position & Q(created_at=anchor.created_at, id__gt=anchor.id))
+                    )
+                    .order_by("position", "created_at", "id")
+                    .first()
+                )
+                new_position = position_between(anchor.position, neighbor.position if neighbor else None)
 
             updated_at = timezone.now()
-            updates = [
-                Task(id=task_id, position=index, updated_at=updated_at)
-                for index, task_id in enumerate(ordered_ids, start=1)
-            ]
-            Task.objects.bulk_update(updates, ["position", "updated_at"])
+            if new_position is not None:
+                Task.objects.filter(id=task.id).update(position=new_position, updated_at=updated_at)
+                changed_positions = {task.id: new_position}
+            else:
+                # No integer gap left next to the target: respace the whole org's ordering.
+                current_positions = dict(
+                    Task.objects.select_for_update()
+                    .filter(organization_id=task.organization_id)
+                    .order_by("position", "created_at", "id")
+                    .values_list("id", "position")
+                )
+                ordered_ids = list(current_positions)
+                ordered_ids.remove(task.id)
+                target_index = ordered_ids.index(target_task.id)
+                insert_index = target_index if placement == "before" else target_index + 1
+                ordered_ids.insert(insert_index, task.id)
+
+                changed_positions = {
+                    task_id: position
+                    for task_id, position in spaced_positions(ordered_ids).items()
+                    if current_positions[task_id] != position
+                }
+                updates = [
+                    Task(id=task_id, position=position, updated_at=updated_at)
+                    for task_id, position in changed_positions.items()
+                ]
+                Task.objects.bulk_update(updates, ["position", "updated_at"], batch_size=REORDER_UPDATE_BATCH_SIZE)
 
             def _emit_reorder_events():
                 created_events = TaskChangeEvent.objects.bulk_create(
                     [
                         TaskChangeEvent(
-                            organization=task.organization,
+                            organization_id=task.organization_id,
                             event_type=TaskChangeEvent.EventType.UPDATED,
                             task_id=task_id,
-                            payload_summary={"position": index, "reordered": True},
+                            payload_summary={"position": position, "reordered": True},
                         )
-                        for index, task_id in enumerate(ordered_ids, start=1)
+                        for task_id, position in changed_positions.items()
                     ]
                 )
                 if created_events:
                     enqueue_task_change_sync_notifications(
-                        organization=task.organization,
+                        organization=task.organization_id,
                         event_id=created_events[-1].id,
                         event_type=TaskChangeEvent.EventType.UPDATED,
                         task_id=str(task.id),
@@ -331,7 +423,7 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
             poll_interval_ms = 1000
         poll_interval_ms = max(200, min(poll_interval_ms, 5000))
 
-        current_cursor = self._change_cursor()
+        current_cursor = change_cursor(self._org())
         if not cursor:
             return Response({"changed": False, "cursor": current_cursor})
         if cursor != current_cursor:
@@ -346,7 +438,7 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
             if sleep_seconds > 0:
                 time.sleep(sleep_seconds)
 
-            current_cursor = self._change_cursor()
+            current_cursor = change_cursor(self._org())
             if cursor != current_cursor:
                 return Response({"changed": True, "cursor": current_cursor})
 
@@ -359,7 +451,8 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
         parser_classes=[MultiPartParser, FormParser],
     )
     def upload_attachment(self, request, pk=None):
-        task = self.get_object()
+        task = get_object_or_404(self.get_queryset().only("id", "organization_id"), pk=pk)
+        self.check_object_permissions(request, task)
         uploaded_file = request.FILES.get("file")
         if uploaded_file is None:
             return Response(
@@ -398,31 +491,46 @@ class TaskViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
         relative_path = f"tasks/{task.organization_id}/{task.id}/{unique_folder}/{safe_name}"
         saved_path = default_storage.save(relative_path, uploaded_file)
 
-        attachments = task.attachments or []
-        attachments.append(
-            {
-                "name": original_name,
-                "path": saved_path,
-            }
-        )
-        task.attachments = attachments
-        task.save(update_fields=["attachments", "updated_at"])
+        with transaction.atomic():
+            # Lock the row so concurrent uploads cannot drop each other's appended entries,
+            # and skip hydrating the large text columns that the append never touches.
+            task = (
+                Task.objects.select_for_update()
+                .defer(*ATTACHMENT_UPLOAD_DEFERRED_FIELDS)
+                .get(id=task.id)
+            )
+            attachments = task.attachments or []
+            attachments.append(
+                {
+                    "name": original_name,
+                    "path": saved_path,
+                }
+            )
+            task.attachments = attachments
+            task.save(update_fields=["attachments", "updated_at"])
 
         return Response(
             {
-                "attachments": TaskSerializer(task, context={"request": request}).data.get("attachments", []),
+                "attachments": represent_task_attachments(task.attachments),
             },
             status=status.HTTP_201_CREATED,
         )
 
 
+def _enqueue_dedupe_check(task_id: str) -> None:
+    try:
+        dedupe_check.apply_async(args=[task_id], retry=False)
+    except Exception:  # noqa: BLE001
+        logger.warning("failed to enqueue duplicate check for task %s", task_id, exc_info=True)
+
+
 class ProjectViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ["get", "post", "patch"]
 
     def get_queryset(self):
-        queryset = Project.objects.filter(organization=self._org())
+        queryset = Project.objects.filter(organization_id=self._org())
         area = self.request.query_params.get("area")
         q = (self.request.query_params.get("q") or "").strip()
         limit_value = self.request.query_params.get("limit")
@@ -445,7 +553,7 @@ class ProjectViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
         return queryset
 
     def perform_create(self, serializer):
-        serializer.save(organization=self._org())
+        serializer.save(organization_id=self._org())
 
 
 class TagViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
@@ -454,10 +562,10 @@ class TagViewSet(OrgScopedQuerysetMixin, viewsets.ModelViewSet):
     http_method_names = ["get", "post"]
 
     def get_queryset(self):
-        return Tag.objects.filter(organization=self._org()).order_by("name")
+        return Tag.objects.filter(organization_id=self._org()).order_by("name")
 
     def perform_create(self, serializer):
-        serializer.save(organization=self._org())
+        serializer.save(organization_id=self._org())
 
 
 @api_view(["POST"])
@@ -474,12 +582,7 @@ def bookmarklet_capture_view(request):
     source_link = request.data.get("url") or request.data.get("source_link") or ""
     source_snippet = request.data.get("snippet") or request.data.get("source_snippet") or ""
 
-    next_position = (
-        Task.objects.filter(organization=request.user.organization).aggregate(max_position=Max("position"))[
-            "max_position"
-        ]
-        or 0
-    ) + 1
+    next_position = next_task_position(request.user.organization_id)
     task = Task.objects.create(
         organization=request.user.organization,
         created_by_user=request.user,
@@ -645,7 +748,11 @@ def inbound_email_capture_view(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    organization = Organization.objects.filter(inbound_email_address__iexact=recipient).first()
+    organization = (
+        Organization.objects.filter(inbound_email_address__iexact=recipient)
+        .only("id", "inbound_email_token", "inbound_email_whitelist")
+        .first()
+    )
     expected_token = organization.inbound_email_token if organization is not None else ""
     if not organization or not verify_inbound_ingest_token(provided_token, expected_token):
         return Response(
@@ -712,6 +819,7 @@ def inbound_email_capture_view(request):
             priority_override=priority_override,
             source_external_id=source_external_id,
             source_origin=source_origin,
+            parsed=parsed,
         )
     except IntegrityError:
         existing_task = _find_existing_email_task(organization, source_external_id)
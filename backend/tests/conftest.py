@@ -0,0 +1,138 @@
+import functools
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.test import APIClient, force_authenticate
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Organization, User
+
+
+def _make_user(**fields):
+    # None of the fixture users log in with a password, so skip hashing one.
+    user = User(**fields)
+    user.set_unusable_password()
+    user.save()
+    return user
+
+
+@pytest.fixture(scope="module")
+def shared_org(django_db_setup, django_db_blocker):
+    # Committed once per module and removed afterwards, so other modules (e.g. first-user OIDC
+    # provisioning) never see these rows. Tests must treat them as read-only.
+    with django_db_blocker.unblock():
+        Organization.objects.filter(name="Shared Org").delete()
+        org = Organization.objects.create(name="Shared Org")
+        users = {
+            role.value: _make_user(
+                email=f"shared-{role.value}@example.com",
+                role=role,
+                organization=org,
+            )
+            for role in User.Role
+        }
+    yield SimpleNamespace(org=org, owner=users["owner"], admin=users["admin"], member=users["member"])
+    with django_db_blocker.unblock():
+        org.delete()
+
+
+@pytest.fixture(scope="module")
+def other_org(django_db_setup, django_db_blocker):
+    # Second tenant for cross-org checks; committed and read-only like shared_org.
+    with django_db_blocker.unblock():
+        Organization.objects.filter(name="Other Org").delete()
+        org = Organization.objects.create(name="Other Org")
+        member = _make_user(email="other-member@example.com", role=User.Role.MEMBER, organization=org)
+    yield SimpleNamespace(org=org, member=member)
+    with django_db_blocker.unblock():
+        org.delete()
+
+
+@pytest.fixture(scope="module")
+def oauth_owner(django_db_setup, django_db_blocker):
+    # Committed once per module like shared_org; tests change org fields only inside their own transaction.
+    with django_db_blocker.unblock():
+        Organization.objects.filter(name="OAuth Org").delete()
+        org = Organization.objects.create(name="OAuth Org")
+        owner = _make_user(
+            email="oauth-owner@example.com",
+            role=User.Role.OWNER,
+            organization=org,
+        )
+    yield owner
+    with django_db_blocker.unblock():
+        org.delete()
+
+
+@pytest.fixture(scope="module")
+def _module_api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def api_client(_module_api_client, db):
+    # One client per module; credentials, forced auth and cookies are dropped after each test.
+    yield _module_api_client
+    _module_api_client.logout()
+
+
+@pytest.fixture(scope="session")
+def _access_tokens():
+    return {}
+
+
+def _bearer_client(access_tokens, user):
+    # Signing a token also records an OutstandingToken row; reuse the access token per user pk.
+    token = access_tokens.get(user.pk)
+    if token is None:
+        token = access_tokens[user.pk] = str(RefreshToken.for_user(user).access_token)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.fixture
+def bearer_client(_access_tokens):
+    return functools.partial(_bearer_client, _access_tokens)
+
+
+@pytest.fixture(scope="module")
+def owner_client(oauth_owner, _access_tokens, django_db_blocker):
+    with django_db_blocker.unblock():
+        return _bearer_client(_access_tokens, oauth_owner)
+
+
+def _view_dispatch(viewset, actions, request, user, **kwargs):
+    # Calls the viewset directly: no URL resolution, middleware or authentication classes.
+    force_authenticate(request, user=user)
+    return viewset.as_view(actions)(request, **kwargs)
+
+
+@pytest.fixture
+def view_dispatch():
+    return _view_dispatch
+
+
+@pytest.fixture(scope="module")
+def member_client(shared_org, _access_tokens, django_db_blocker):
+    # Shared by the module's tests; those needing another user or no credentials build their own client.
+    with django_db_blocker.unblock():
+        return _bearer_client(_access_tokens, shared_org.member)
+
+
+@pytest.fixture
+def email_org(db):
+    return Organization.objects.create(
+        name="Email Org",
+        inbound_email_address="tasks@example.com",
+        inbound_email_token="token-123",
+    )
+
+
+@pytest.fixture
+def email_owner(email_org):
+    return _make_user(
+        email="owner@example.com",
+        role=User.Role.OWNER,
+        organization=email_org,
+    )
@@ -4,8 +4,8 @@ import pytest
 
 from ai.factory import get_provider
 from ai.privacy import cloud_allowed
-from ai.semantic import dedupe_candidates, semantic_search_with_fallback
-from ai.tasks import embed_task, suggest_metadata
+from ai.semantic import dedupe_candidates, semantic_search_with_fallback, title_similarity
+from ai.tasks import dedupe_check, embed_task, suggest_metadata
 from core.models import Organization, User
 from tasks.models import Task
 
@@ -42,9 +42,29 @@ def test_semantic_fallback_and_dedupe_candidates():
     assert len(candidates) == 1
 
 
+def test_title_similarity_ignores_word_order_and_keeps_exact_mode():
+    assert title_similarity("Call vendor about invoice", "invoice: call vendor about") == 1.0
+    assert title_similarity("Call vendor about invoice", "invoice: call vendor about", exact=True) < 0.92
+    assert title_similarity("Review plans", "Send invoice") < 0.92
+
+
 def test_celery_ai_tasks_skip_when_ai_off(monkeypatch):
     monkeypatch.setenv("AI_MODE", "off")
     suggest = suggest_metadata("task-1")
     embed = embed_task("task-1")
     assert suggest["status"] == "skipped"
     assert embed["status"] == "skipped"
+
+
+@pytest.mark.django_db
+def test_dedupe_check_stores_candidates_on_the_task():
+    org = Organization.objects.create(name="Dedupe Org")
+    user = User.objects.create_user(email="dedupe@example.com", password="StrongPass123!", organization=org)
+    existing = Task.objects.create(organization=org, created_by_user=user, title="Fix login bug", area=Task.Area.WORK)
+    created = Task.objects.create(organization=org, created_by_user=user, title="Fix logn bug", area=Task.Area.WORK)
+
+    result = dedupe_check(str(created.id))
+
+    assert result["status"] == "ok"
+    created.refresh_from_db()
+    assert [item["task_id"] for item in created.duplicate_candidates] == [str(existing.id)]
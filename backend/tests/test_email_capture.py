@@ -1,16 +1,17 @@
+import functools
+import io
 from email.message import EmailMessage
 
 import pytest
 from django.core.files.storage import default_storage
-from django.core.files.uploadedfile import SimpleUploadedFile
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from core.models import Organization, User
 from core.security import INBOUND_TOKEN_HASH_PREFIX
 from core.crypto import ENCRYPTED_VALUE_PREFIX
 from tasks.models import Project, Task
 
+pytestmark = pytest.mark.django_db(transaction=False, reset_sequences=False)
+
 
 def _build_eml(
     subject: str,
@@ -21,6 +22,29 @@ def _build_eml(
     html_body: str | None = None,
     attachments: list[tuple[str, bytes, str]] | None = None,
     inline_images: list[tuple[str, bytes, str, str]] | None = None,
+) -> bytes:
+    return _build_eml_cached(
+        subject,
+        body,
+        to_address,
+        from_address,
+        message_id,
+        html_body,
+        tuple(attachments or ()),
+        tuple(inline_images or ()),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _build_eml_cached(
+    subject: str,
+    body: str,
+    to_address: str,
+    from_address: str,
+    message_id: str | None,
+    html_body: str | None,
+    attachments: tuple[tuple[str, bytes, str], ...],
+    inline_images: tuple[tuple[str, bytes, str, str], ...],
 ) -> bytes:
     message = EmailMessage()
     message["From"] = from_address
@@ -43,32 +67,45 @@ def _build_eml(
                     cid=f"<{content_id}>",
                     disposition="inline",
                 )
-    for filename, payload, content_type in attachments or []:
+    for filename, payload, content_type in attachments:
         maintype, subtype = content_type.split("/", 1)
         message.add_attachment(payload, maintype=maintype, subtype=subtype, filename=filename)
     return message.as_bytes()
 
 
+def _upload(name: str, data: bytes, content_type: str = "message/rfc822") -> io.BytesIO:
+    # The multipart encoder only needs read(), name and content_type.
+    upload = io.BytesIO(data)
+    upload.name = name
+    upload.content_type = content_type
+    return upload
+
+
+def _title_only_eml(from_address: str) -> bytes:
+    return (
+        f"From: {from_address}\r\nTo: tasks@example.com\r\n"
+        "Subject: Task\r\nContent-Type: text/plain\r\n\r\nTitle only\r\n"
+    ).encode()
+
+
+_EML_TITLE_ONLY = _title_only_eml("sender@example.com")
+_EML_TITLE_ONLY_BLOCKED = _title_only_eml("blocked@example.com")
+_EML_TITLE_ONLY_APPROVED = _title_only_eml("approved@example.com")
+
+
 @pytest.fixture(autouse=True)
-def _temporary_media_root(settings, tmp_path):
-    settings.MEDIA_ROOT = tmp_path / "media"
+def _in_memory_storage(settings):
+    settings.STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
     settings.MEDIA_URL = "/media/"
 
 
-@pytest.mark.django_db
-def test_email_capture_settings_can_be_configured_by_owner():
-    org = Organization.objects.create(name="Email Org")
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
-    token = RefreshToken.for_user(owner)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_email_capture_settings_can_be_configured_by_owner(api_client, email_org, email_owner):
+    api_client.force_authenticate(user=email_owner)
 
-    response = client.patch(
+    response = api_client.patch(
         "/settings/email-capture",
         {
             "inbound_email_address": "Tasks@Example.com",
@@ -82,60 +119,40 @@ def test_email_capture_settings_can_be_configured_by_owner():
     assert response.data["inbound_email_address"] == "tasks@example.com"
     assert response.data["inbound_email_token"]
     assert response.data["inbound_email_whitelist"] == ["approved@example.com", "other@example.com"]
-    org.refresh_from_db()
-    assert org.inbound_email_token.startswith(INBOUND_TOKEN_HASH_PREFIX)
+    email_org.refresh_from_db()
+    assert email_org.inbound_email_token.startswith(INBOUND_TOKEN_HASH_PREFIX)
 
-    get_response = client.get("/settings/email-capture")
+    get_response = api_client.get("/settings/email-capture")
     assert get_response.status_code == 200
     assert get_response.data["inbound_email_token"] == ""
 
 
-@pytest.mark.django_db
-def test_email_capture_settings_reject_member():
-    org = Organization.objects.create(name="Email Org")
-    member = User.objects.create_user(
-        email="member@example.com",
-        password="StrongPass123!",
-        role=User.Role.MEMBER,
-        organization=org,
-    )
-    client = APIClient()
-    token = RefreshToken.for_user(member)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_email_capture_settings_reject_member(api_client, shared_org):
+    api_client.force_authenticate(user=shared_org.member)
 
-    response = client.patch("/settings/email-capture", {"inbound_email_address": "tasks@example.com"}, format="json")
+    response = api_client.patch("/settings/email-capture", {"inbound_email_address": "tasks@example.com"}, format="json")
     assert response.status_code == 403
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_creates_task_with_loose_project_match_and_clean_body():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    project = Project.objects.create(organization=org, name="ADC LBB", area=Project.Area.WORK)
+def test_inbound_email_capture_creates_task_with_loose_project_match_and_clean_body(
+    api_client, email_org, email_owner, django_assert_num_queries
+):
+    project = Project.objects.create(organization=email_org, name="ADC LBB", area=Project.Area.WORK)
 
-    client = APIClient()
     raw_eml = _build_eml(
         subject="Forwarded context",
         body="Verify the lighting layout\nADCLBB\nwork\nhigh\n\nForwarded thread below.",
         to_address="tasks@example.com",
     )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+    uploaded = _upload("forwarded.eml", raw_eml)
 
-    response = client.post(
-        "/capture/email/inbound",
-        {"recipient": "tasks@example.com", "email": uploaded},
-        format="multipart",
-        HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
-    )
+    with django_assert_num_queries(7):
+        response = api_client.post(
+            "/capture/email/inbound",
+            {"recipient": "tasks@example.com", "email": uploaded},
+            format="multipart",
+            HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
+        )
 
     assert response.status_code == 201
     assert response.data["title"] == "Verify the lighting layout"
@@ -143,67 +160,16 @@ def test_inbound_email_capture_creates_task_with_loose_project_match_and_clean_b
     assert response.data["priority"] == 5
     assert str(response.data["project"]) == str(project.id)
     assert response.data["source_type"] == Task.SourceType.EMAIL
-    assert str(response.data["created_by_user"]) == str(owner.id)
+    assert str(response.data["created_by_user"]) == str(email_owner.id)
     assert response.data["notes"] == ""
     assert "Forwarded thread below." in response.data["source_snippet"]
     assert len(response.data["attachments"]) == 2
-    attachment_names = {attachment["name"] for attachment in response.data["attachments"]}
+    attachment_names = frozenset(attachment["name"] for attachment in response.data["attachments"])
     assert "email-preview.html" in attachment_names
     assert any(name.endswith(".eml") for name in attachment_names)
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_defaults_to_subject_work_low():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    project = Project.objects.create(organization=org, name="ADC LBB", area=Project.Area.WORK)
-
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Subject fallback title",
-        body="<task title>\nadc lbb\n<work or personal>\n<priority>\n",
-        to_address="tasks@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
-
-    response = client.post(
-        "/capture/email/inbound",
-        {"recipient": "tasks@example.com", "email": uploaded},
-        format="multipart",
-        HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
-    )
-
-    assert response.status_code == 201
-    assert response.data["title"] == "Subject fallback title"
-    assert response.data["area"] == Task.Area.WORK
-    assert response.data["priority"] == 1
-    assert str(response.data["project"]) == str(project.id)
-
-
-@pytest.mark.django_db
-def test_inbound_email_capture_strips_embedded_headers_and_saves_real_attachments():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-
-    client = APIClient()
+def test_inbound_email_capture_strips_embedded_headers_and_saves_real_attachments(api_client, email_owner):
     raw_eml = _build_eml(
         subject="Client update",
         body=(
@@ -218,9 +184,9 @@ def test_inbound_email_capture_strips_embedded_headers_and_saves_real_attachment
         to_address="tasks@example.com",
         attachments=[("scope.txt", b"new attachment payload", "text/plain")],
     )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+    uploaded = _upload("forwarded.eml", raw_eml)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {"recipient": "tasks@example.com", "email": uploaded},
         format="multipart",
@@ -232,29 +198,15 @@ def test_inbound_email_capture_strips_embedded_headers_and_saves_real_attachment
     assert response.data["source_snippet"] == "Client update\nProject A\nwork\nhigh"
     assert "Original Message" not in response.data["source_snippet"]
     assert len(response.data["attachments"]) == 3
-    attachment_names = {attachment["name"] for attachment in response.data["attachments"]}
-    assert "email-preview.html" in attachment_names
-    assert "scope.txt" in attachment_names
+    attachment_names = frozenset(attachment["name"] for attachment in response.data["attachments"])
+    assert {"email-preview.html", "scope.txt"} <= attachment_names
     assert any(name.endswith(".eml") for name in attachment_names)
 
     for attachment in response.data["attachments"]:
         assert default_storage.exists(attachment["path"])
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_uses_html_body_when_plain_part_is_header_only():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
+def test_inbound_email_capture_uses_html_body_when_plain_part_is_header_only(api_client, email_owner):
     raw_eml = _build_eml(
         subject="Fwd: Site visit update",
         body=(
@@ -273,9 +225,9 @@ def test_inbound_email_capture_uses_html_body_when_plain_part_is_header_only():
         ),
         to_address="tasks@example.com",
     )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+    uploaded = _upload("forwarded.eml", raw_eml)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {"recipient": "tasks@example.com", "email": uploaded},
         format="multipart",
@@ -291,20 +243,7 @@ def test_inbound_email_capture_uses_html_body_when_plain_part_is_header_only():
     assert "Crane access approved." in response.data["source_snippet"]
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_saves_rendered_email_preview_with_inline_images_and_links():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
+def test_inbound_email_capture_saves_rendered_email_preview_with_inline_images_and_links(api_client, email_owner):
     raw_eml = _build_eml(
         subject="Inline photo update",
         body="Please see inline image",
@@ -316,9 +255,9 @@ def test_inbound_email_capture_saves_rendered_email_preview_with_inline_images_a
         to_address="tasks@example.com",
         inline_images=[("photo.png", b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "image/png", "photo-1")],
     )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+    uploaded = _upload("forwarded.eml", raw_eml)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {"recipient": "tasks@example.com", "email": uploaded},
         format="multipart",
@@ -327,9 +266,8 @@ def test_inbound_email_capture_saves_rendered_email_preview_with_inline_images_a
 
     assert response.status_code == 201
     attachments = response.data["attachments"]
-    attachment_names = {attachment["name"] for attachment in attachments}
-    assert "email-preview.html" in attachment_names
-    assert "photo.png" in attachment_names
+    attachment_names = frozenset(attachment["name"] for attachment in attachments)
+    assert {"email-preview.html", "photo.png"} <= attachment_names
     assert any(name.endswith(".eml") for name in attachment_names)
 
     preview_attachment = next(attachment for attachment in attachments if attachment["name"] == "email-preview.html")
@@ -343,153 +281,104 @@ def test_inbound_email_capture_saves_rendered_email_preview_with_inline_images_a
     assert "data:image/png;base64" in preview_html
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_supports_force_project_and_creates_when_missing():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Lighting coordination",
-        body=(
-            "Project: ADC LBB\n"
-            "Please review latest reflected ceiling plans.\n"
+@pytest.mark.parametrize(
+    (
+        "subject",
+        "body",
+        "existing_project",
+        "expected_title",
+        "expected_priority",
+        "expected_project",
+        "expected_snippet",
+        "query_count",
+    ),
+    [
+        pytest.param(
+            "Subject fallback title",
+            "<task title>\nadc lbb\n<work or personal>\n<priority>\n",
+            "ADC LBB",
+            "Subject fallback title",
+            1,
+            "ADC LBB",
+            "<task title>\nadc lbb\n<work or personal>\n<priority>",
+            7,
+            id="defaults_to_subject_work_low",
         ),
-        to_address="tasks@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
-
-    response = client.post(
-        "/capture/email/inbound",
-        {"recipient": "tasks@example.com", "email": uploaded},
-        format="multipart",
-        HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
-    )
-
-    assert response.status_code == 201
-    project = Project.objects.get(organization=org, name="ADC LBB")
-    assert str(response.data["project"]) == str(project.id)
-    assert response.data["title"] == "Please review latest reflected ceiling plans."
-    assert response.data["notes"] == ""
-
-
-@pytest.mark.django_db
-def test_inbound_email_capture_supports_force_task_subject_and_force_project():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    Project.objects.create(organization=org, name="ADC LBB", area=Project.Area.WORK)
-
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Subject to force",
-        body=(
-            "Task: Subject\n"
-            "Project: ADC LBB\n"
-            "Work\n"
-            "High\n"
-            "Body context line\n"
+        pytest.param(
+            "Lighting coordination",
+            "Project: ADC LBB\nPlease review latest reflected ceiling plans.\n",
+            None,
+            "Please review latest reflected ceiling plans.",
+            1,
+            "ADC LBB",
+            "Please review latest reflected ceiling plans.",
+            8,
+            id="force_project_creates_when_missing",
         ),
-        to_address="tasks@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
-
-    response = client.post(
-        "/capture/email/inbound",
-        {"recipient": "tasks@example.com", "email": uploaded},
-        format="multipart",
-        HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
-    )
-
-    assert response.status_code == 201
-    assert response.data["title"] == "Subject to force"
-    assert response.data["notes"] == ""
-    assert response.data["source_snippet"] == "Work\nHigh\nBody context line"
-    assert response.data["area"] == Task.Area.WORK
-    assert response.data["priority"] == 5
-    assert response.data["project"] is not None
-
-
-@pytest.mark.django_db
-def test_inbound_email_capture_supports_priority_before_area_with_force_directives():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Fw: CMH - G&W Programming Spec Review",
-        body=(
-            "Task: Subject\n"
-            "Project: ADC CMH02\n"
-            "High\n"
-            "Work\n"
+        pytest.param(
+            "Subject to force",
+            "Task: Subject\nProject: ADC LBB\nWork\nHigh\nBody context line\n",
+            "ADC LBB",
+            "Subject to force",
+            5,
+            "ADC LBB",
+            "Work\nHigh\nBody context line",
+            7,
+            id="force_task_subject_and_force_project",
         ),
-        to_address="tasks@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
-
-    response = client.post(
-        "/capture/email/inbound",
-        {"recipient": "tasks@example.com", "email": uploaded},
-        format="multipart",
-        HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
-    )
+        pytest.param(
+            "Fw: CMH - G&W Programming Spec Review",
+            "Task: Subject\nProject: ADC CMH02\nHigh\nWork\n",
+            None,
+            "Fw: CMH - G&W Programming Spec Review",
+            5,
+            "ADC CMH02",
+            "High\nWork",
+            8,
+            id="priority_before_area",
+        ),
+    ],
+)
+def test_inbound_email_capture_directives(
+    api_client,
+    email_org,
+    email_owner,
+    django_assert_num_queries,
+    subject,
+    body,
+    existing_project,
+    expected_title,
+    expected_priority,
+    expected_project,
+    expected_snippet,
+    query_count,
+):
+    if existing_project:
+        Project.objects.create(organization=email_org, name=existing_project, area=Project.Area.WORK)
+    uploaded = _upload("forwarded.eml", _build_eml(subject=subject, body=body, to_address="tasks@example.com"))
+
+    with django_assert_num_queries(query_count):
+        response = api_client.post(
+            "/capture/email/inbound",
+            {"recipient": "tasks@example.com", "email": uploaded},
+            format="multipart",
+            HTTP_X_TASKHUB_INGEST_TOKEN="token-123",
+        )
 
     assert response.status_code == 201
-    assert response.data["title"] == "Fw: CMH - G&W Programming Spec Review"
+    assert response.data["title"] == expected_title
     assert response.data["area"] == Task.Area.WORK
-    assert response.data["priority"] == 5
-    assert response.data["project"] is not None
+    assert response.data["priority"] == expected_priority
+    assert response.data["notes"] == ""
+    project = Project.objects.get(organization=email_org, name=expected_project)
+    assert str(response.data["project"]) == str(project.id)
+    assert response.data["source_snippet"] == expected_snippet
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_rejects_invalid_token():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Task",
-        body="Title only",
-        to_address="tasks@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+def test_inbound_email_capture_rejects_invalid_token(api_client, email_owner):
+    uploaded = _upload("forwarded.eml", _EML_TITLE_ONLY)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {"recipient": "tasks@example.com", "email": uploaded},
         format="multipart",
@@ -499,30 +388,12 @@ def test_inbound_email_capture_rejects_invalid_token():
     assert response.status_code == 403
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_rejects_sender_not_in_whitelist():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-        inbound_email_whitelist=["approved@example.com"],
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Task",
-        body="Title only",
-        to_address="tasks@example.com",
-        from_address="blocked@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+def test_inbound_email_capture_rejects_sender_not_in_whitelist(api_client, email_org, email_owner):
+    email_org.inbound_email_whitelist = ["approved@example.com"]
+    email_org.save(update_fields=["inbound_email_whitelist"])
+    uploaded = _upload("forwarded.eml", _EML_TITLE_ONLY_BLOCKED)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {"recipient": "tasks@example.com", "email": uploaded},
         format="multipart",
@@ -532,30 +403,12 @@ def test_inbound_email_capture_rejects_sender_not_in_whitelist():
     assert response.status_code == 403
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_allows_sender_in_whitelist():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-        inbound_email_whitelist=["approved@example.com"],
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
-    raw_eml = _build_eml(
-        subject="Task",
-        body="Title only",
-        to_address="tasks@example.com",
-        from_address="approved@example.com",
-    )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+def test_inbound_email_capture_allows_sender_in_whitelist(api_client, email_org, email_owner):
+    email_org.inbound_email_whitelist = ["approved@example.com"]
+    email_org.save(update_fields=["inbound_email_whitelist"])
+    uploaded = _upload("forwarded.eml", _EML_TITLE_ONLY_APPROVED)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {"recipient": "tasks@example.com", "email": uploaded},
         format="multipart",
@@ -565,29 +418,15 @@ def test_inbound_email_capture_allows_sender_in_whitelist():
     assert response.status_code == 201
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_explicit_overrides_take_precedence():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-
-    client = APIClient()
+def test_inbound_email_capture_explicit_overrides_take_precedence(api_client, email_org, email_owner):
     raw_eml = _build_eml(
         subject="Original subject",
         body="Body-derived title\nBody project\nwork\nlow\n",
         to_address="tasks@example.com",
     )
-    uploaded = SimpleUploadedFile("forwarded.eml", raw_eml, content_type="message/rfc822")
+    uploaded = _upload("forwarded.eml", raw_eml)
 
-    response = client.post(
+    response = api_client.post(
         "/capture/email/inbound",
         {
             "recipient": "tasks@example.com",
@@ -609,25 +448,11 @@ def test_inbound_email_capture_explicit_overrides_take_precedence():
     assert response.data["priority"] == 4
     assert response.data["source_type"] == Task.SourceType.EMAIL
     assert response.data["source_link"] == "outlook_addin"
-    project = Project.objects.get(organization=org, name="Override Project")
+    project = Project.objects.get(organization=email_org, name="Override Project")
     assert str(response.data["project"]) == str(project.id)
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_idempotent_replay_uses_source_external_id():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-
-    client = APIClient()
+def test_inbound_email_capture_idempotent_replay_uses_source_external_id(api_client, email_org, email_owner):
     source_external_id = "outlook-message-abc123"
     first_raw_eml = _build_eml(
         subject="First subject",
@@ -640,10 +465,10 @@ def test_inbound_email_capture_idempotent_replay_uses_source_external_id():
         to_address="tasks@example.com",
     )
 
-    first_uploaded = SimpleUploadedFile("first.eml", first_raw_eml, content_type="message/rfc822")
-    second_uploaded = SimpleUploadedFile("second.eml", second_raw_eml, content_type="message/rfc822")
+    first_uploaded = _upload("first.eml", first_raw_eml)
+    second_uploaded = _upload("second.eml", second_raw_eml)
 
-    first_response = client.post(
+    first_response = api_client.post(
         "/capture/email/inbound",
         {
             "recipient": "tasks@example.com",
@@ -657,7 +482,7 @@ def test_inbound_email_capture_idempotent_replay_uses_source_external_id():
     assert first_response.status_code == 201
     assert first_response.data["idempotent_replay"] is False
 
-    second_response = client.post(
+    second_response = api_client.post(
         "/capture/email/inbound",
         {
             "recipient": "tasks@example.com",
@@ -672,24 +497,10 @@ def test_inbound_email_capture_idempotent_replay_uses_source_external_id():
     assert second_response.data["idempotent_replay"] is True
     assert second_response.data["id"] == first_response.data["id"]
     assert second_response.data["title"] == "First created title"
-    assert Task.objects.filter(organization=org).count() == 1
+    assert Task.objects.filter(organization=email_org).count() == 1
 
 
-@pytest.mark.django_db
-def test_inbound_email_capture_idempotent_replay_falls_back_to_message_id_header():
-    org = Organization.objects.create(
-        name="Email Org",
-        inbound_email_address="tasks@example.com",
-        inbound_email_token="token-123",
-    )
-    User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-
-    client = APIClient()
+def test_inbound_email_capture_idempotent_replay_falls_back_to_message_id_header(api_client, email_org, email_owner):
     message_id = "<taskhub-test-message-id@example.com>"
     first_raw_eml = _build_eml(
         subject="Header fallback first",
@@ -704,10 +515,10 @@ def test_inbound_email_capture_idempotent_replay_falls_back_to_message_id_header
         message_id=message_id,
     )
 
-    first_uploaded = SimpleUploadedFile("first.eml", first_raw_eml, content_type="message/rfc822")
-    second_uploaded = SimpleUploadedFile("second.eml", second_raw_eml, content_type="message/rfc822")
+    first_uploaded = _upload("first.eml", first_raw_eml)
+    second_uploaded = _upload("second.eml", second_raw_eml)
 
-    first_response = client.post(
+    first_response = api_client.post(
         "/capture/email/inbound",
         {
             "recipient": "tasks@example.com",
@@ -719,7 +530,7 @@ def test_inbound_email_capture_idempotent_replay_falls_back_to_message_id_header
     assert first_response.status_code == 201
     assert first_response.data["idempotent_replay"] is False
 
-    second_response = client.post(
+    second_response = api_client.post(
         "/capture/email/inbound",
         {
             "recipient": "tasks@example.com",
@@ -731,23 +542,13 @@ def test_inbound_email_capture_idempotent_replay_falls_back_to_message_id_header
     assert second_response.status_code == 200
     assert second_response.data["idempotent_replay"] is True
     assert second_response.data["id"] == first_response.data["id"]
-    assert Task.objects.filter(organization=org).count() == 1
+    assert Task.objects.filter(organization=email_org).count() == 1
 
 
-@pytest.mark.django_db
-def test_email_capture_settings_can_store_imap_fields_without_returning_password():
-    org = Organization.objects.create(name="Email Org")
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = APIClient()
-    token = RefreshToken.for_user(owner)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_email_capture_settings_can_store_imap_fields_without_returning_password(api_client, email_org, email_owner):
+    api_client.force_authenticate(user=email_owner)
 
-    response = client.patch(
+    response = api_client.patch(
         "/settings/email-capture",
         {
             "imap_username": "imap-user@example.com",
@@ -768,14 +569,13 @@ def test_email_capture_settings_can_store_imap_fields_without_returning_password
     assert response.data["imap_password_configured"] is True
     assert "imap_password" not in response.data
 
-    org.refresh_from_db()
-    assert org.imap_username == "imap-user@example.com"
-    assert org.imap_password.startswith(ENCRYPTED_VALUE_PREFIX)
-    assert org.get_imap_password() == "secret-password"
+    email_org.refresh_from_db()
+    assert email_org.imap_username == "imap-user@example.com"
+    assert email_org.imap_password.startswith(ENCRYPTED_VALUE_PREFIX)
+    assert email_org.get_imap_password() == "secret-password"
 
 
-@pytest.mark.django_db
-def test_email_capture_settings_can_clear_imap_password():
+def test_email_capture_settings_can_clear_imap_password(api_client):
     org = Organization.objects.create(name="Email Org", imap_username="imap-user@example.com", imap_password="secret")
     owner = User.objects.create_user(
         email="owner@example.com",
@@ -783,11 +583,9 @@ def test_email_capture_settings_can_clear_imap_password():
         role=User.Role.OWNER,
         organization=org,
     )
-    client = APIClient()
-    token = RefreshToken.for_user(owner)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+    api_client.force_authenticate(user=owner)
 
-    response = client.patch(
+    response = api_client.patch(
         "/settings/email-capture",
         {"imap_clear_password": True},
         format="json",
@@ -1,16 +1,20 @@
+import functools
 from email.message import EmailMessage
 
 import pytest
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from core.models import Organization, User
 from tasks.models import Task
 
+pytestmark = pytest.mark.django_db(transaction=False, reset_sequences=False)
+
 
 class _FakeMailbox:
-    def __init__(self, raw_message: bytes):
-        self._raw_message = raw_message
+    def __init__(self, *raw_messages: bytes):
+        self._fetch_results = [
+            (f"{index} (RFC822)".encode(), raw_message) for index, raw_message in enumerate(raw_messages, start=1)
+        ]
+        self._search_result = b" ".join(str(index).encode() for index in range(1, len(raw_messages) + 1))
         self.store_calls = []
 
     def login(self, username, password):
@@ -20,10 +24,10 @@ class _FakeMailbox:
         return "OK", [b"1"]
 
     def search(self, charset, criteria):
-        return "OK", [b"1"]
+        return "OK", [self._search_result]
 
     def fetch(self, message_id, _parts):
-        return "OK", [(b"1 (RFC822)", self._raw_message)]
+        return "OK", [self._fetch_results[int(message_id) - 1]]
 
     def store(self, message_id, operation, flags):
         self.store_calls.append((message_id, operation, flags))
@@ -33,13 +37,7 @@ class _FakeMailbox:
         return "BYE", [b"logged out"]
 
 
-def _auth_client(user):
-    client = APIClient()
-    token = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-    return client
-
-
+@functools.lru_cache(maxsize=None)
 def _build_eml(subject: str, body: str, to_address: str, from_address: str = "sender@example.com") -> bytes:
     message = EmailMessage()
     message["From"] = from_address
@@ -50,13 +48,15 @@ def _build_eml(subject: str, body: str, to_address: str, from_address: str = "se
 
 
 @pytest.fixture(autouse=True)
-def _temporary_media_root(settings, tmp_path):
-    settings.MEDIA_ROOT = tmp_path / "media"
+def _in_memory_storage(settings):
+    settings.STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
     settings.MEDIA_URL = "/media/"
 
 
-@pytest.mark.django_db
-def test_imap_sync_endpoint_creates_task(monkeypatch):
+def test_imap_sync_endpoint_creates_task(api_client, monkeypatch):
     monkeypatch.setenv("INBOUND_EMAIL_MODE", "imap")
 
     org = Organization.objects.create(
@@ -77,7 +77,7 @@ def test_imap_sync_endpoint_creates_task(monkeypatch):
         role=User.Role.OWNER,
         organization=org,
     )
-    client = _auth_client(owner)
+    api_client.force_authenticate(user=owner)
 
     raw_eml = _build_eml(
         subject="Subject fallback title",
@@ -93,7 +93,7 @@ def test_imap_sync_endpoint_creates_task(monkeypatch):
 
     monkeypatch.setattr("tasks.email_imap_service.imaplib.IMAP4_SSL", fake_ssl)
 
-    response = client.post("/settings/email-capture/imap/sync", {"max_messages": 10}, format="json")
+    response = api_client.post("/settings/email-capture/imap/sync", {"max_messages": 10}, format="json")
 
     assert response.status_code == 200
     assert response.data["processed"] == 1
@@ -104,39 +104,23 @@ def test_imap_sync_endpoint_creates_task(monkeypatch):
     assert seen_host["value"] == "imap.example.com"
 
 
-@pytest.mark.django_db
-def test_imap_sync_endpoint_rejects_when_mode_is_not_imap(monkeypatch):
+def test_imap_sync_endpoint_rejects_when_mode_is_not_imap(api_client, monkeypatch, email_owner):
     monkeypatch.setenv("INBOUND_EMAIL_MODE", "webhook")
 
-    org = Organization.objects.create(name="Email Org")
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = _auth_client(owner)
+    api_client.force_authenticate(user=email_owner)
 
-    response = client.post("/settings/email-capture/imap/sync", {"max_messages": 10}, format="json")
+    response = api_client.post("/settings/email-capture/imap/sync", {"max_messages": 10}, format="json")
 
     assert response.status_code == 400
     assert response.data["error_code"] == "validation_error"
 
 
-@pytest.mark.django_db
-def test_imap_sync_endpoint_requires_imap_configuration(monkeypatch):
+def test_imap_sync_endpoint_requires_imap_configuration(api_client, monkeypatch, email_owner):
     monkeypatch.setenv("INBOUND_EMAIL_MODE", "imap")
 
-    org = Organization.objects.create(name="Email Org")
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = _auth_client(owner)
+    api_client.force_authenticate(user=email_owner)
 
-    response = client.post("/settings/email-capture/imap/sync", {"max_messages": 10}, format="json")
+    response = api_client.post("/settings/email-capture/imap/sync", {"max_messages": 10}, format="json")
 
     assert response.status_code == 400
     assert response.data["error_code"] == "validation_error"
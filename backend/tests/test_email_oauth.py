@@ -1,53 +1,120 @@
+import functools
+import json
 from base64 import urlsafe_b64encode
 from email.message import EmailMessage
+from types import SimpleNamespace
 from urllib.parse import parse_qs, urlparse
 
 import pytest
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
+import requests
 
 from core.email_oauth_views import (
+    GMAIL_BATCH_URL,
     GMAIL_MESSAGES_URL,
     GOOGLE_OAUTH_TOKEN_URL,
     GOOGLE_USERINFO_URL,
 )
-from core.crypto import ENCRYPTED_VALUE_PREFIX
-from core.models import Organization, User
+from core.crypto import ENCRYPTED_VALUE_PREFIX, decrypt_secret
+from core.models import Organization
 from tasks.models import Task
 
 
 class _MockResponse:
-    def __init__(self, status_code, payload):
+    __slots__ = ("status_code", "_payload", "content", "headers")
+
+    def __init__(self, status_code, payload, content=b"", headers=None):
         self.status_code = status_code
         self._payload = payload
+        self.content = content
+        self.headers = headers or {}
 
     def json(self):
         return self._payload
 
 
-def _auth_client(user):
-    client = APIClient()
-    token = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-    return client
+# Returned as-is from every fake call; the views only read these payloads.
+_OK_EMPTY = _MockResponse(200, {})
+_OK_TOKEN = _MockResponse(200, {"access_token": "access-token"})
 
 
-@pytest.mark.django_db
-def test_gmail_oauth_initiate_returns_auth_url(monkeypatch):
+@functools.lru_cache(maxsize=None)
+def _raw_b64(sender: str, subject: str, body: str) -> str:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = "gmail-user@example.com"
+    message["Subject"] = subject
+    message.set_content(body)
+    return urlsafe_b64encode(message.as_bytes()).decode("utf-8").rstrip("=")
+
+
+def _batch_response(raw_by_id):
+    # Shaped like Gmail's multipart/mixed batch reply: one application/http part per message.
+    parts = [
+        (
+            f"--batch_test\r\nContent-Type: application/http\r\nContent-ID: <response-{message_id}>\r\n\r\n"
+            f"HTTP/1.1 200 OK\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n"
+            f"{json.dumps({'id': message_id, 'raw': raw_b64})}\r\n"
+        )
+        for message_id, raw_b64 in raw_by_id.items()
+    ]
+    return _MockResponse(
+        200,
+        None,
+        content=("".join(parts) + "--batch_test--\r\n").encode("utf-8"),
+        headers={"Content-Type": "multipart/mixed; boundary=batch_test"},
+    )
+
+
+def _patch_requests(monkeypatch, fake_post, fake_get):
+    # Swap the view module's reference in one setattr rather than patching the real requests module.
+    monkeypatch.setattr(
+        "core.email_oauth_views.requests",
+        SimpleNamespace(post=fake_post, get=fake_get, RequestException=requests.RequestException),
+    )
+
+
+def _fake_gmail(monkeypatch, raw_by_id):
+    batch_bodies = []
+
+    def fake_post(url, data=None, json=None, timeout=0, **kwargs):
+        if url == GOOGLE_OAUTH_TOKEN_URL:
+            return _OK_TOKEN
+        if url == GMAIL_BATCH_URL:
+            batch_bodies.append(data.decode("utf-8"))
+            return _batch_response(raw_by_id)
+        if url.startswith(f"{GMAIL_MESSAGES_URL}/") and url.endswith("/modify"):
+            return _OK_EMPTY
+        raise AssertionError(f"unexpected POST url: {url}")
+
+    def fake_get(url, headers=None, params=None, timeout=0, **kwargs):
+        if url == GMAIL_MESSAGES_URL:
+            return _MockResponse(200, {"messages": [{"id": message_id} for message_id in raw_by_id]})
+        raise AssertionError(f"unexpected GET url: {url}")
+
+    _patch_requests(monkeypatch, fake_post, fake_get)
+    return batch_bodies
+
+
+@pytest.fixture(autouse=True)
+def _google_oauth_env(monkeypatch):
     monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "client-id")
     monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "client-secret")
     monkeypatch.setenv("GOOGLE_OAUTH_REDIRECT_URI", "http://localhost:8080/settings")
 
-    org = Organization.objects.create(name="Org")
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
+
+def _connect_gmail(owner, **fields):
+    Organization.objects.filter(pk=owner.organization_id).update(
+        inbound_email_provider=Organization.InboundEmailProvider.GMAIL_OAUTH,
+        inbound_email_address="gmail-user@example.com",
+        gmail_oauth_email="gmail-user@example.com",
+        gmail_oauth_refresh_token="refresh-token",
+        **fields,
     )
-    client = _auth_client(owner)
 
-    response = client.post("/settings/email-capture/oauth/google/initiate", {}, format="json")
+
+@pytest.mark.django_db
+def test_gmail_oauth_initiate_returns_auth_url(owner_client):
+    response = owner_client.post("/settings/email-capture/oauth/google/initiate")
     assert response.status_code == 200
     auth_url = response.data["auth_url"]
     assert "accounts.google.com" in auth_url
@@ -55,21 +122,8 @@ def test_gmail_oauth_initiate_returns_auth_url(monkeypatch):
 
 
 @pytest.mark.django_db
-def test_gmail_oauth_exchange_connects_org(monkeypatch):
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "client-id")
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "client-secret")
-    monkeypatch.setenv("GOOGLE_OAUTH_REDIRECT_URI", "http://localhost:8080/settings")
-
-    org = Organization.objects.create(name="Org")
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = _auth_client(owner)
-
-    initiate = client.post("/settings/email-capture/oauth/google/initiate", {}, format="json")
+def test_gmail_oauth_exchange_connects_org(monkeypatch, oauth_owner, owner_client):
+    initiate = owner_client.post("/settings/email-capture/oauth/google/initiate")
     state = parse_qs(urlparse(initiate.data["auth_url"]).query)["state"][0]
 
     def fake_post(url, data=None, timeout=0, **kwargs):
@@ -81,10 +135,9 @@ def test_gmail_oauth_exchange_connects_org(monkeypatch):
         assert url == GOOGLE_USERINFO_URL
         return _MockResponse(200, {"email": "gmail-user@example.com"})
 
-    monkeypatch.setattr("core.email_oauth_views.requests.post", fake_post)
-    monkeypatch.setattr("core.email_oauth_views.requests.get", fake_get)
+    _patch_requests(monkeypatch, fake_post, fake_get)
 
-    response = client.post(
+    response = owner_client.post(
         "/settings/email-capture/oauth/google/exchange",
         {"code": "oauth-code", "state": state},
         format="json",
@@ -94,113 +147,52 @@ def test_gmail_oauth_exchange_connects_org(monkeypatch):
     assert response.data["gmail_oauth_connected"] is True
     assert response.data["gmail_oauth_email"] == "gmail-user@example.com"
 
-    org.refresh_from_db()
-    assert org.gmail_oauth_email == "gmail-user@example.com"
-    assert org.gmail_oauth_refresh_token.startswith(ENCRYPTED_VALUE_PREFIX)
-    assert org.get_gmail_oauth_refresh_token() == "refresh-token"
+    gmail_email, stored_refresh_token = Organization.objects.values_list(
+        "gmail_oauth_email", "gmail_oauth_refresh_token"
+    ).get(pk=oauth_owner.organization_id)
+    assert gmail_email == "gmail-user@example.com"
+    assert stored_refresh_token.startswith(ENCRYPTED_VALUE_PREFIX)
+    assert decrypt_secret(stored_refresh_token) == "refresh-token"
 
 
 @pytest.mark.django_db
-def test_gmail_oauth_sync_imports_message(monkeypatch):
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "client-id")
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "client-secret")
-    monkeypatch.setenv("GOOGLE_OAUTH_REDIRECT_URI", "http://localhost:8080/settings")
-
-    org = Organization.objects.create(
-        name="Org",
-        inbound_email_provider=Organization.InboundEmailProvider.GMAIL_OAUTH,
-        inbound_email_address="gmail-user@example.com",
-        gmail_oauth_email="gmail-user@example.com",
-        gmail_oauth_refresh_token="refresh-token",
-    )
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = _auth_client(owner)
-
-    message = EmailMessage()
-    message["From"] = "allowed@example.com"
-    message["To"] = "gmail-user@example.com"
-    message["Subject"] = "OAuth Task"
-    message.set_content("Task from oauth sync\nProject X\nwork\nhigh")
-    raw_b64 = urlsafe_b64encode(message.as_bytes()).decode("utf-8").rstrip("=")
-
-    def fake_post(url, data=None, json=None, timeout=0, **kwargs):
-        if url == GOOGLE_OAUTH_TOKEN_URL:
-            return _MockResponse(200, {"access_token": "access-token"})
-        if url == f"{GMAIL_MESSAGES_URL}/m1/modify":
-            return _MockResponse(200, {})
-        raise AssertionError(f"unexpected POST url: {url}")
-
-    def fake_get(url, headers=None, params=None, timeout=0, **kwargs):
-        if url == GMAIL_MESSAGES_URL:
-            return _MockResponse(200, {"messages": [{"id": "m1"}]})
-        if url == f"{GMAIL_MESSAGES_URL}/m1":
-            return _MockResponse(200, {"raw": raw_b64})
-        raise AssertionError(f"unexpected GET url: {url}")
-
-    monkeypatch.setattr("core.email_oauth_views.requests.post", fake_post)
-    monkeypatch.setattr("core.email_oauth_views.requests.get", fake_get)
+@pytest.mark.parametrize(
+    ("sender", "whitelist", "title", "created", "failed"),
+    [
+        pytest.param("allowed@example.com", [], "Task from oauth sync", 1, 0, id="imports_message"),
+        pytest.param("blocked@example.com", ["allowed@example.com"], "Blocked task", 0, 1, id="respects_whitelist"),
+    ],
+)
+def test_gmail_oauth_sync(monkeypatch, oauth_owner, owner_client, sender, whitelist, title, created, failed):
+    _connect_gmail(oauth_owner, inbound_email_whitelist=whitelist)
+    _fake_gmail(monkeypatch, {"m1": _raw_b64(sender, "OAuth Task", f"{title}\nProject X\nwork\nhigh")})
 
-    response = client.post("/settings/email-capture/oauth/google/sync", {"max_messages": 5}, format="json")
+    response = owner_client.post("/settings/email-capture/oauth/google/sync", {"max_messages": 5}, format="json")
     assert response.status_code == 200
     assert response.data["processed"] == 1
-    assert response.data["created"] == 1
-    assert response.data["failed"] == []
-    assert Task.objects.filter(organization=org, title="Task from oauth sync").exists()
+    assert response.data["created"] == created
+    assert len(response.data["failed"]) == failed
+    assert Task.objects.filter(organization_id=oauth_owner.organization_id, title=title).exists() == bool(created)
 
 
 @pytest.mark.django_db
-def test_gmail_oauth_sync_respects_whitelist(monkeypatch):
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "client-id")
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "client-secret")
-    monkeypatch.setenv("GOOGLE_OAUTH_REDIRECT_URI", "http://localhost:8080/settings")
-
-    org = Organization.objects.create(
-        name="Org",
-        inbound_email_provider=Organization.InboundEmailProvider.GMAIL_OAUTH,
-        inbound_email_address="gmail-user@example.com",
-        inbound_email_whitelist=["allowed@example.com"],
-        gmail_oauth_email="gmail-user@example.com",
-        gmail_oauth_refresh_token="refresh-token",
+def test_gmail_oauth_sync_fetches_all_messages_in_one_batch(monkeypatch, oauth_owner, owner_client):
+    _connect_gmail(oauth_owner)
+    message_ids = ["m1", "m2", "m3"]
+    batch_bodies = _fake_gmail(
+        monkeypatch,
+        {
+            message_id: _raw_b64("allowed@example.com", "OAuth Task", f"Batch task {message_id}\nProject X\nwork\nhigh")
+            for message_id in message_ids
+        },
     )
-    owner = User.objects.create_user(
-        email="owner@example.com",
-        password="StrongPass123!",
-        role=User.Role.OWNER,
-        organization=org,
-    )
-    client = _auth_client(owner)
-
-    message = EmailMessage()
-    message["From"] = "blocked@example.com"
-    message["To"] = "gmail-user@example.com"
-    message["Subject"] = "Blocked Task"
-    message.set_content("Blocked task\nProject X\nwork\nhigh")
-    raw_b64 = urlsafe_b64encode(message.as_bytes()).decode("utf-8").rstrip("=")
-
-    def fake_post(url, data=None, json=None, timeout=0, **kwargs):
-        if url == GOOGLE_OAUTH_TOKEN_URL:
-            return _MockResponse(200, {"access_token": "access-token"})
-        if url == f"{GMAIL_MESSAGES_URL}/m1/modify":
-            return _MockResponse(200, {})
-        raise AssertionError(f"unexpected POST url: {url}")
-
-    def fake_get(url, headers=None, params=None, timeout=0, **kwargs):
-        if url == GMAIL_MESSAGES_URL:
-            return _MockResponse(200, {"messages": [{"id": "m1"}]})
-        if url == f"{GMAIL_MESSAGES_URL}/m1":
-            return _MockResponse(200, {"raw": raw_b64})
-        raise AssertionError(f"unexpected GET url: {url}")
-
-    monkeypatch.setattr("core.email_oauth_views.requests.post", fake_post)
-    monkeypatch.setattr("core.email_oauth_views.requests.get", fake_get)
 
-    response = client.post("/settings/email-capture/oauth/google/sync", {"max_messages": 5}, format="json")
+    response = owner_client.post("/settings/email-capture/oauth/google/sync", {"max_messages": 5}, format="json")
     assert response.status_code == 200
-    assert response.data["processed"] == 1
-    assert response.data["created"] == 0
-    assert len(response.data["failed"]) == 1
+    assert response.data["processed"] == 3
+    assert response.data["created"] == 3
+    assert response.data["failed"] == []
+    assert len(batch_bodies) == 1
+    assert all(f"/messages/{message_id}?format=raw" in batch_bodies[0] for message_id in message_ids)
+    titles = set(Task.objects.filter(organization_id=oauth_owner.organization_id).values_list("title", flat=True))
+    assert titles == {f"Batch task {message_id}" for message_id in message_ids}
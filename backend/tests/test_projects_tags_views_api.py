@@ -1,97 +1,108 @@
 import pytest
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APIRequestFactory
 
-from core.models import Organization, User
+from collaboration.views import SavedViewViewSet
+from core.models import Organization
 from tasks.models import Project, Task
+from tasks.views import ProjectViewSet, TagViewSet
 
 
 @pytest.mark.django_db
-def test_projects_tags_views_crud():
-    org = Organization.objects.create(name="Org")
-    user = User.objects.create_user(email="u@example.com", password="StrongPass123!", organization=org)
-
-    client = APIClient()
-    token = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    project_res = client.post(
-        "/projects/",
-        {"name": "Project A", "area": "work", "is_active": True, "is_shared": False},
-        format="json",
+def test_projects_tags_views_crud(shared_org, view_dispatch):
+    user = shared_org.member
+    factory = APIRequestFactory()
+
+    project_res = view_dispatch(
+        ProjectViewSet,
+        {"post": "create"},
+        factory.post(
+            "/projects/",
+            {"name": "Project A", "area": "work", "is_active": True, "is_shared": False},
+            format="json",
+        ),
+        user,
     )
     assert project_res.status_code == 201
 
-    tag_res = client.post("/tags/", {"name": "urgent", "color": "red"}, format="json")
+    tag_res = view_dispatch(
+        TagViewSet,
+        {"post": "create"},
+        factory.post("/tags/", {"name": "urgent", "color": "red"}, format="json"),
+        user,
+    )
     assert tag_res.status_code == 201
 
-    view_res = client.post(
-        "/views/",
-        {
-            "name": "Inbox View",
-            "filter_json": {"status": "inbox"},
-            "sort_field": "created_at",
-            "sort_order": "desc",
-            "is_shared": False,
-        },
-        format="json",
+    saved_views = {"get": "list", "post": "create"}
+    view_res = view_dispatch(
+        SavedViewViewSet,
+        saved_views,
+        factory.post(
+            "/views/",
+            {
+                "name": "Inbox View",
+                "filter_json": {"status": "inbox"},
+                "sort_field": "created_at",
+                "sort_order": "desc",
+                "is_shared": False,
+            },
+            format="json",
+        ),
+        user,
     )
     assert view_res.status_code == 201
 
-    get_views = client.get("/views/")
+    get_views = view_dispatch(SavedViewViewSet, saved_views, factory.get("/views/"), user)
     assert get_views.status_code == 200
     assert len(get_views.data) == 1
 
-    delete_res = client.delete(f"/views/{view_res.data['id']}/")
+    view_id = view_res.data["id"]
+    delete_res = view_dispatch(
+        SavedViewViewSet, {"delete": "destroy"}, factory.delete(f"/views/{view_id}/"), user, pk=view_id
+    )
     assert delete_res.status_code == 204
 
 
-@pytest.mark.django_db
-def test_projects_list_supports_area_q_limit_filters():
-    org = Organization.objects.create(name="Org Filter")
-    user = User.objects.create_user(email="filters@example.com", password="StrongPass123!", organization=org)
+@pytest.fixture
+def listed_projects(shared_org):
+    org = shared_org.org
     other_org = Organization.objects.create(name="Other Org")
-    User.objects.create_user(email="other@example.com", password="StrongPass123!", organization=other_org)
-
-    Project.objects.create(organization=org, name="Alpha Work", area="work")
-    Project.objects.create(organization=org, name="Beta Work", area="work")
-    Project.objects.create(organization=org, name="Gamma Personal", area="personal")
-    Project.objects.create(organization=other_org, name="Alpha External", area="work")
-
-    client = APIClient()
-    token = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    filtered = client.get("/projects/?area=work&q=alpha&limit=1")
-    assert filtered.status_code == 200
-    assert len(filtered.data) == 1
-    assert filtered.data[0]["name"] == "Alpha Work"
-
-    work_only = client.get("/projects/?area=work")
-    assert work_only.status_code == 200
-    returned_names = {item["name"] for item in work_only.data}
-    assert returned_names == {"Alpha Work", "Beta Work"}
-
-
-@pytest.mark.django_db
-def test_projects_list_can_filter_to_only_projects_with_tasks():
-    org = Organization.objects.create(name="Org Has Tasks")
-    user = User.objects.create_user(email="has-tasks@example.com", password="StrongPass123!", organization=org)
-
-    project_with_task = Project.objects.create(organization=org, name="Has Task", area="work")
-    Project.objects.create(organization=org, name="No Task", area="work")
-    Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Linked task",
-        area=Task.Area.WORK,
-        project=project_with_task,
+    projects = Project.objects.bulk_create(
+        [
+            Project(organization=org, name="Alpha Work", area="work"),
+            Project(organization=org, name="Beta Work", area="work"),
+            Project(organization=org, name="Gamma Personal", area="personal"),
+            Project(organization=org, name="Has Task", area="work"),
+            Project(organization=org, name="No Task", area="work"),
+            Project(organization=other_org, name="Alpha External", area="work"),
+        ]
+    )
+    # bulk_create skips the task post_save hooks, which only feed mobile sync and are not under test here.
+    Task.objects.bulk_create(
+        [
+            Task(
+                organization=org,
+                created_by_user=shared_org.member,
+                title="Linked task",
+                area=Task.Area.WORK,
+                project=projects[3],
+            )
+        ]
     )
+    return projects
 
-    client = APIClient()
-    token = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
 
-    filtered = client.get("/projects/?has_tasks=true")
-    assert filtered.status_code == 200
-    assert [item["name"] for item in filtered.data] == ["Has Task"]
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("query", "expected_names"),
+    [
+        pytest.param("area=work&q=alpha&limit=1", ["Alpha Work"], id="area_q_limit"),
+        pytest.param("area=work", ["Alpha Work", "Beta Work", "Has Task", "No Task"], id="area"),
+        pytest.param("has_tasks=true", ["Has Task"], id="has_tasks"),
+    ],
+)
+def test_projects_list_filters(member_client, listed_projects, django_assert_num_queries, query, expected_names):
+    # One query to load the token's user, one for the filtered list.
+    with django_assert_num_queries(2):
+        response = member_client.get(f"/projects/?{query}")
+    assert response.status_code == 200
+    assert [item["name"] for item in response.data] == expected_names
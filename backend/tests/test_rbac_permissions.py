@@ -3,29 +3,30 @@ import pytest
 from core.models import Organization, User
 from core.rbac import can_assign_to_user, can_manage_org_resources
 
-
-@pytest.mark.django_db
-def test_rbac_owner_admin_manage_resources():
-    org = Organization.objects.create(name="Org")
-    owner = User.objects.create_user(email="owner@x.com", password="StrongPass123!", role=User.Role.OWNER, organization=org)
-    admin = User.objects.create_user(email="admin@x.com", password="StrongPass123!", role=User.Role.ADMIN, organization=org)
-    member = User.objects.create_user(email="member@x.com", password="StrongPass123!", role=User.Role.MEMBER, organization=org)
-
-    assert can_manage_org_resources(owner) is True
-    assert can_manage_org_resources(admin) is True
-    assert can_manage_org_resources(member) is False
-
-
-@pytest.mark.django_db
-def test_rbac_assignment_rules():
-    org1 = Organization.objects.create(name="Org1")
-    org2 = Organization.objects.create(name="Org2")
-
-    owner = User.objects.create_user(email="owner@x.com", password="StrongPass123!", role=User.Role.OWNER, organization=org1)
-    member_same_org = User.objects.create_user(email="member@x.com", password="StrongPass123!", role=User.Role.MEMBER, organization=org1)
-    member_other_org = User.objects.create_user(email="other@x.com", password="StrongPass123!", role=User.Role.MEMBER, organization=org2)
-
-    assert can_assign_to_user(owner, member_same_org) is True
-    assert can_assign_to_user(member_same_org, member_same_org) is True
-    assert can_assign_to_user(member_same_org, owner) is False
-    assert can_assign_to_user(owner, member_other_org) is False
+# The rules only compare role, organization_id and id, so unsaved instances are enough.
+_ORG = Organization(name="Org1")
+_OTHER_ORG = Organization(name="Org2")
+_USERS = {
+    "owner": User(id=1, email="owner@x.com", role=User.Role.OWNER, organization=_ORG),
+    "admin": User(id=2, email="admin@x.com", role=User.Role.ADMIN, organization=_ORG),
+    "member": User(id=3, email="member@x.com", role=User.Role.MEMBER, organization=_ORG),
+    "member_other_org": User(id=4, email="other@x.com", role=User.Role.MEMBER, organization=_OTHER_ORG),
+}
+
+
+@pytest.mark.parametrize(("user", "expected"), [("owner", True), ("admin", True), ("member", False)])
+def test_rbac_owner_admin_manage_resources(user, expected):
+    assert can_manage_org_resources(_USERS[user]) is expected
+
+
+@pytest.mark.parametrize(
+    ("actor", "assignee", "expected"),
+    [
+        ("owner", "member", True),
+        ("member", "member", True),
+        ("member", "owner", False),
+        ("owner", "member_other_org", False),
+    ],
+)
+def test_rbac_assignment_rules(actor, assignee, expected):
+    assert can_assign_to_user(_USERS[actor], _USERS[assignee]) is expected
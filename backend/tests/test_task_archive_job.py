@@ -3,15 +3,16 @@ from datetime import timedelta
 import pytest
 from django.utils import timezone
 
-from core.models import Organization, User
 from tasks.models import Task
 from tasks.tasks import archive_completed_tasks
 
 
 @pytest.mark.django_db
-def test_archive_completed_job_archives_old_done_tasks(monkeypatch):
-    org = Organization.objects.create(name="Archive Org")
-    user = User.objects.create_user(email="archive@example.com", password="StrongPass123!", organization=org)
+def test_archive_completed_job_archives_old_done_tasks(monkeypatch, shared_org):
+    now = timezone.now()
+    # The job derives its cutoff from timezone.now(); pin it so both tasks sit at fixed offsets from it.
+    monkeypatch.setattr("django.utils.timezone.now", lambda: now)
+    org, user = shared_org.org, shared_org.member
 
     old_done = Task.objects.create(
         organization=org,
@@ -19,24 +20,21 @@ def test_archive_completed_job_archives_old_done_tasks(monkeypatch):
         title="Old done",
         area=Task.Area.WORK,
         status=Task.Status.DONE,
-        completed_at=timezone.now() - timedelta(days=14),
+        completed_at=now - timedelta(days=14),
     )
-    recent_done = Task.objects.create(
+    Task.objects.create(
         organization=org,
         created_by_user=user,
         title="Recent done",
         area=Task.Area.WORK,
         status=Task.Status.DONE,
-        completed_at=timezone.now() - timedelta(days=2),
+        completed_at=now - timedelta(days=2),
     )
 
     monkeypatch.setenv("TASK_ARCHIVE_AFTER_DAYS", "7")
     result = archive_completed_tasks()
 
-    old_done.refresh_from_db()
-    recent_done.refresh_from_db()
-
     assert result["status"] == "ok"
     assert result["archived_count"] == 1
-    assert old_done.status == Task.Status.ARCHIVED
-    assert recent_done.status == Task.Status.DONE
+    assert result["archived_ids"] == [str(old_done.pk)]
+    assert Task.objects.values_list("status", flat=True).get(pk=old_done.pk) == Task.Status.ARCHIVED
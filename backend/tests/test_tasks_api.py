@@ -2,109 +2,110 @@ from datetime import timedelta
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APIClient, APIRequestFactory
 from django.utils import timezone
 
-from core.models import Organization, User
-from tasks.models import Project, Task
+from tasks.changes import change_cursor
+from tasks.models import Project, Tag, Task, TaskChangeEvent
+from tasks.ordering import POSITION_GAP
+from tasks.views import TaskViewSet
 
+_NOTE_BYTES = b"hello task attachment"
+_factory = APIRequestFactory()
 
-@pytest.mark.django_db
-def test_tasks_crud_and_filters_and_semantic_contract():
-    org = Organization.objects.create(name="Org")
-    user = User.objects.create_user(email="u@example.com", password="StrongPass123!", organization=org)
 
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def _upload(client, task_id, name="note.txt", data=_NOTE_BYTES, content_type="text/plain"):
+    return client.post(
+        f"/tasks/{task_id}/attachments/upload/",
+        {"file": SimpleUploadedFile(name, data, content_type=content_type)},
+        format="multipart",
+    )
+
 
-    create_res = client.post("/tasks/", {"title": "Task A", "area": "work"}, format="json")
+def _create_task(view_dispatch, user, payload):
+    request = _factory.post("/tasks/", payload, format="json")
+    return view_dispatch(TaskViewSet, {"post": "create"}, request, user)
+
+
+def _patch_task(view_dispatch, user, task_id, payload):
+    request = _factory.patch(f"/tasks/{task_id}/", payload, format="json")
+    return view_dispatch(TaskViewSet, {"patch": "partial_update"}, request, user, pk=task_id)
+
+
+@pytest.mark.django_db
+def test_tasks_crud_and_filters_and_semantic_contract(member_client, django_assert_max_num_queries):
+    create_res = member_client.post("/tasks/", {"title": "Task A", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    list_res = client.get("/tasks/?page=1&page_size=25&sort=created_at&order=desc")
+    with django_assert_max_num_queries(4):
+        list_res = member_client.get("/tasks/?page=1&page_size=25&sort=created_at&order=desc")
     assert list_res.status_code == 200
     assert list_res.data["semantic_requested"] is False
     assert list_res.data["semantic_used"] is False
 
-    semantic_bad = client.get("/tasks/?semantic=true")
+    semantic_bad = member_client.get("/tasks/?semantic=true")
     assert semantic_bad.status_code == 400
 
-    detail_res = client.get(f"/tasks/{task_id}/")
+    detail_res = member_client.get(f"/tasks/{task_id}/")
     assert detail_res.status_code == 200
 
-    patch_res = client.patch(f"/tasks/{task_id}/", {"status": "done"}, format="json")
+    patch_res = member_client.patch(f"/tasks/{task_id}/", {"status": "done"}, format="json")
     assert patch_res.status_code == 200
 
-    invalid_transition = client.patch(f"/tasks/{task_id}/", {"status": "inbox"}, format="json")
+    invalid_transition = member_client.patch(f"/tasks/{task_id}/", {"status": "inbox"}, format="json")
     assert invalid_transition.status_code == 409
 
 
 @pytest.mark.django_db
-def test_tasks_cross_tenant_returns_404():
-    org_a = Organization.objects.create(name="Org A")
-    org_b = Organization.objects.create(name="Org B")
-
-    user_a = User.objects.create_user(email="a@example.com", password="StrongPass123!", organization=org_a)
-    user_b = User.objects.create_user(email="b@example.com", password="StrongPass123!", organization=org_b)
-
+def test_tasks_cross_tenant_returns_404(other_org, member_client):
     task_b = Task.objects.create(
-        organization=org_b,
-        created_by_user=user_b,
+        organization=other_org.org,
+        created_by_user=other_org.member,
         title="Tenant B Task",
         area=Task.Area.WORK,
     )
 
-    token = RefreshToken.for_user(user_a)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    res = client.get(f"/tasks/{task_b.id}/")
+    res = member_client.get(f"/tasks/{task_b.id}/")
     assert res.status_code == 404
 
 
 @pytest.mark.django_db
-def test_tasks_list_hides_done_items_older_than_24_hours():
-    org = Organization.objects.create(name="Org")
-    user = User.objects.create_user(email="u2@example.com", password="StrongPass123!", organization=org)
-
-    old_done = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Old done",
-        area=Task.Area.WORK,
-        status=Task.Status.DONE,
-        completed_at=timezone.now() - timedelta(days=2),
+def test_tasks_list_hides_done_items_older_than_24_hours(shared_org, member_client, django_assert_max_num_queries):
+    org, user = shared_org.org, shared_org.member
+
+    now = timezone.now()
+    old_done, recent_done, open_task, archived_task = Task.objects.bulk_create(
+        [
+            Task(
+                organization=org,
+                created_by_user=user,
+                title="Old done",
+                area=Task.Area.WORK,
+                status=Task.Status.DONE,
+                completed_at=now - timedelta(days=2),
+            ),
+            Task(
+                organization=org,
+                created_by_user=user,
+                title="Recent done",
+                area=Task.Area.WORK,
+                status=Task.Status.DONE,
+                completed_at=now - timedelta(hours=2),
+            ),
+            Task(organization=org, created_by_user=user, title="Open", area=Task.Area.WORK, status=Task.Status.INBOX),
+            Task(
+                organization=org,
+                created_by_user=user,
+                title="Archived",
+                area=Task.Area.WORK,
+                status=Task.Status.ARCHIVED,
+            ),
+        ]
     )
-    recent_done = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Recent done",
-        area=Task.Area.WORK,
-        status=Task.Status.DONE,
-        completed_at=timezone.now() - timedelta(hours=2),
-    )
-    open_task = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Open",
-        area=Task.Area.WORK,
-        status=Task.Status.INBOX,
-    )
-    archived_task = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Archived",
-        area=Task.Area.WORK,
-        status=Task.Status.ARCHIVED,
-    )
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
 
-    res = client.get("/tasks/?page=1&page_size=50&sort=created_at&order=desc")
+    with django_assert_max_num_queries(4):
+        res = member_client.get("/tasks/?page=1&page_size=50&sort=created_at&order=desc")
     assert res.status_code == 200
     returned_ids = {item["id"] for item in res.data["results"]}
     assert str(old_done.id) not in returned_ids
@@ -112,7 +113,8 @@ def test_tasks_list_hides_done_items_older_than_24_hours():
     assert str(open_task.id) in returned_ids
     assert str(archived_task.id) not in returned_ids
 
-    history_res = client.get("/tasks/?page=1&page_size=50&sort=created_at&order=desc&include_history=true")
+    with django_assert_max_num_queries(4):
+        history_res = member_client.get("/tasks/?page=1&page_size=50&sort=created_at&order=desc&include_history=true")
     assert history_res.status_code == 200
     history_ids = {item["id"] for item in history_res.data["results"]}
     assert str(old_done.id) in history_ids
@@ -120,208 +122,253 @@ def test_tasks_list_hides_done_items_older_than_24_hours():
 
 
 @pytest.mark.django_db
-def test_tasks_list_hides_dated_tasks_until_within_seven_days():
-    org = Organization.objects.create(name="Upcoming Org")
-    user = User.objects.create_user(email="upcoming@example.com", password="StrongPass123!", organization=org)
-
-    visible_task = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Visible soon",
-        area=Task.Area.WORK,
-        due_at=timezone.now() + timedelta(days=5),
-    )
-    hidden_task = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Hidden later",
-        area=Task.Area.WORK,
-        due_at=timezone.now() + timedelta(days=18),
-    )
-    undated_task = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="No date",
-        area=Task.Area.WORK,
+def test_tasks_list_hides_dated_tasks_until_within_seven_days(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+
+    now = timezone.now()
+    visible_task, hidden_task, undated_task = Task.objects.bulk_create(
+        [
+            Task(
+                organization=org,
+                created_by_user=user,
+                title="Visible soon",
+                area=Task.Area.WORK,
+                due_at=now + timedelta(days=5),
+            ),
+            Task(
+                organization=org,
+                created_by_user=user,
+                title="Hidden later",
+                area=Task.Area.WORK,
+                due_at=now + timedelta(days=18),
+            ),
+            Task(organization=org, created_by_user=user, title="No date", area=Task.Area.WORK),
+        ]
     )
 
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    res = client.get("/tasks/?page=1&page_size=50&sort=position&order=asc")
+    res = member_client.get("/tasks/?page=1&page_size=50&sort=position&order=asc")
     assert res.status_code == 200
     returned_ids = {item["id"] for item in res.data["results"]}
     assert str(visible_task.id) in returned_ids
     assert str(hidden_task.id) not in returned_ids
     assert str(undated_task.id) in returned_ids
 
-    history_res = client.get("/tasks/?page=1&page_size=50&sort=position&order=asc&include_history=true")
+    history_res = member_client.get("/tasks/?page=1&page_size=50&sort=position&order=asc&include_history=true")
     assert history_res.status_code == 200
     history_ids = {item["id"] for item in history_res.data["results"]}
     assert str(hidden_task.id) in history_ids
 
 
 @pytest.mark.django_db
-def test_tasks_reorder_is_persisted_on_backend():
-    org = Organization.objects.create(name="Org Reorder")
-    user = User.objects.create_user(email="reorder@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    t1 = client.post("/tasks/", {"title": "Task 1", "area": "work"}, format="json")
-    t2 = client.post("/tasks/", {"title": "Task 2", "area": "work"}, format="json")
-    t3 = client.post("/tasks/", {"title": "Task 3", "area": "work"}, format="json")
-    assert t1.status_code == 201
-    assert t2.status_code == 201
-    assert t3.status_code == 201
-
-    t1_id = t1.data["id"]
-    t2_id = t2.data["id"]
-    t3_id = t3.data["id"]
-
-    reorder = client.post(
+def test_new_tasks_are_spaced_a_full_position_gap_apart(shared_org, view_dispatch):
+    user = shared_org.member
+    first = _create_task(view_dispatch, user, {"title": "First", "area": "work"})
+    second = _create_task(view_dispatch, user, {"title": "Second", "area": "work"})
+    assert (first.status_code, second.status_code) == (201, 201)
+
+    assert second.data["position"] - first.data["position"] == POSITION_GAP
+
+
+@pytest.mark.django_db
+def test_tasks_reorder_is_persisted_on_backend(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+    t1_id, t2_id, t3_id = (
+        str(task.id)
+        for task in Task.objects.bulk_create(
+            [
+                Task(
+                    organization=org,
+                    created_by_user=user,
+                    title=f"Task {index}",
+                    area=Task.Area.WORK,
+                    position=index * 1000,
+                )
+                for index in (1, 2, 3)
+            ]
+        )
+    )
+
+    reorder = member_client.post(
         f"/tasks/{t3_id}/reorder/",
         {"target_task_id": t1_id, "placement": "before"},
         format="json",
     )
     assert reorder.status_code == 200
 
-    listed = client.get("/tasks/?page=1&page_size=50&sort=position&order=asc")
+    listed = member_client.get("/tasks/?page=1&page_size=50&sort=position&order=asc")
     assert listed.status_code == 200
     ordered_ids = [item["id"] for item in listed.data["results"]]
     assert ordered_ids[:3] == [t3_id, t1_id, t2_id]
 
 
 @pytest.mark.django_db
-def test_tasks_changes_cursor_detects_create_update_and_delete():
-    org = Organization.objects.create(name="Org Live")
-    user = User.objects.create_user(email="live@example.com", password="StrongPass123!", organization=org)
+def test_tasks_reorder_moves_only_the_task_when_positions_have_room(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+    first, second, third = (
+        Task.objects.create(
+            organization=org,
+            created_by_user=user,
+            title=f"Task {index}",
+            area=Task.Area.WORK,
+            position=index * 1024,
+        )
+        for index in (1, 2, 3)
+    )
+
+    reorder = member_client.post(
+        f"/tasks/{third.id}/reorder/",
+        {"target_task_id": str(second.id), "placement": "before"},
+        format="json",
+    )
+    assert reorder.status_code == 200
+    assert reorder.data["position"] == 1536
+    assert dict(Task.objects.filter(organization=org).values_list("title", "position")) == {
+        "Task 1": 1024,
+        "Task 2": 2048,
+        "Task 3": 1536,
+    }
 
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
 
-    baseline = client.get("/tasks/changes/")
+@pytest.mark.django_db
+def test_tasks_reorder_respaces_in_batches_when_positions_are_adjacent(
+    shared_org, member_client, monkeypatch, settings, django_capture_on_commit_callbacks
+):
+    settings.MOBILE_TASK_CHANGE_PUSH_TRIGGER_ASYNC = False
+    # One row per UPDATE batch, so the respace has to span several batches.
+    monkeypatch.setattr("tasks.views.REORDER_UPDATE_BATCH_SIZE", 1)
+    org, user = shared_org.org, shared_org.member
+    first, second, third, fourth = Task.objects.bulk_create(
+        [
+            Task(organization=org, created_by_user=user, title=title, area=Task.Area.WORK, position=position)
+            for title, position in (
+                ("A", POSITION_GAP),
+                ("B", POSITION_GAP + 1),
+                ("C", 3 * POSITION_GAP),
+                ("D", 4 * POSITION_GAP),
+            )
+        ]
+    )
+    updated_before = dict(Task.objects.filter(organization=org).values_list("title", "updated_at"))
+
+    # A and B are adjacent, so C can't be slotted between them without renumbering the org.
+    with django_capture_on_commit_callbacks(execute=True):
+        reorder = member_client.post(
+            f"/tasks/{third.id}/reorder/",
+            {"target_task_id": str(second.id), "placement": "before"},
+            format="json",
+        )
+    assert reorder.status_code == 200
+
+    rows = Task.objects.filter(organization=org).order_by("position").values_list("title", "position", "updated_at")
+    assert [(title, position) for title, position, _ in rows] == [
+        ("A", POSITION_GAP),
+        ("C", 2 * POSITION_GAP),
+        ("B", 3 * POSITION_GAP),
+        ("D", 4 * POSITION_GAP),
+    ]
+    # A and D already sat on their respaced positions: neither rewritten nor reported as changed.
+    assert {title for title, _, updated_at in rows if updated_at != updated_before[title]} == {"B", "C"}
+    assert set(
+        TaskChangeEvent.objects.filter(organization=org, task_id__in=[first.id, second.id, third.id, fourth.id])
+        .values_list("task_id", flat=True)
+    ) == {second.id, third.id}
+
+
+@pytest.mark.django_db
+def test_change_cursor_moves_on_create_update_and_delete(shared_org):
+    org, user = shared_org.org, shared_org.member
+
+    baseline_cursor = change_cursor(org.id)
+
+    task = Task.objects.create(organization=org, created_by_user=user, title="Live create", area=Task.Area.WORK)
+    create_cursor = change_cursor(org.id)
+    assert create_cursor != baseline_cursor
+
+    task.priority = 3
+    task.save(update_fields=["priority", "updated_at"])
+    patch_cursor = change_cursor(org.id)
+    assert patch_cursor != create_cursor
+
+    task.delete()
+    delete_cursor = change_cursor(org.id)
+    assert delete_cursor != patch_cursor
+    assert change_cursor(org.id) == delete_cursor
+
+
+@pytest.mark.django_db
+def test_tasks_changes_endpoint_reports_cursor_moves(shared_org, member_client):
+    baseline = member_client.get("/tasks/changes/")
     assert baseline.status_code == 200
     assert baseline.data["changed"] is False
     baseline_cursor = baseline.data["cursor"]
 
-    create_res = client.post("/tasks/", {"title": "Live create", "area": "work"}, format="json")
+    create_res = member_client.post("/tasks/", {"title": "Live create", "area": "work"}, format="json")
     assert create_res.status_code == 201
-    task_id = create_res.data["id"]
 
-    after_create = client.get("/tasks/changes/", {"cursor": baseline_cursor, "timeout_seconds": 0})
+    after_create = member_client.get("/tasks/changes/", {"cursor": baseline_cursor, "timeout_seconds": 0})
     assert after_create.status_code == 200
     assert after_create.data["changed"] is True
-    create_cursor = after_create.data["cursor"]
-    assert create_cursor != baseline_cursor
-
-    patch_res = client.patch(f"/tasks/{task_id}/", {"priority": 3}, format="json")
-    assert patch_res.status_code == 200
-
-    after_patch = client.get("/tasks/changes/", {"cursor": create_cursor, "timeout_seconds": 0})
-    assert after_patch.status_code == 200
-    assert after_patch.data["changed"] is True
-    patch_cursor = after_patch.data["cursor"]
-    assert patch_cursor != create_cursor
+    assert after_create.data["cursor"] == change_cursor(shared_org.org.id)
 
-    delete_res = client.delete(f"/tasks/{task_id}/")
-    assert delete_res.status_code == 204
-
-    after_delete = client.get("/tasks/changes/", {"cursor": patch_cursor, "timeout_seconds": 0})
-    assert after_delete.status_code == 200
-    assert after_delete.data["changed"] is True
-    delete_cursor = after_delete.data["cursor"]
-    assert delete_cursor != patch_cursor
-
-    no_change = client.get("/tasks/changes/", {"cursor": delete_cursor, "timeout_seconds": 0})
+    no_change = member_client.get("/tasks/changes/", {"cursor": after_create.data["cursor"], "timeout_seconds": 0})
     assert no_change.status_code == 200
     assert no_change.data["changed"] is False
-    assert no_change.data["cursor"] == delete_cursor
+    assert no_change.data["cursor"] == after_create.data["cursor"]
 
 
 @pytest.mark.django_db
-def test_tasks_changes_cursor_detects_reorder_updates():
-    org = Organization.objects.create(name="Org Live Reorder")
-    user = User.objects.create_user(
-        email="live-reorder@example.com", password="StrongPass123!", organization=org
+def test_tasks_reorder_moves_the_change_cursor(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+    first, second = Task.objects.bulk_create(
+        [
+            Task(organization=org, created_by_user=user, title=title, area=Task.Area.WORK, position=index * 1000)
+            for index, title in enumerate(("First", "Second"), start=1)
+        ]
     )
 
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    first = client.post("/tasks/", {"title": "First", "area": "work"}, format="json")
-    second = client.post("/tasks/", {"title": "Second", "area": "work"}, format="json")
-    assert first.status_code == 201
-    assert second.status_code == 201
-
-    cursor_before_reorder = client.get("/tasks/changes/").data["cursor"]
+    cursor_before_reorder = change_cursor(org.id)
 
-    reorder = client.post(
-        f"/tasks/{second.data['id']}/reorder/",
-        {"target_task_id": first.data["id"], "placement": "before"},
+    reorder = member_client.post(
+        f"/tasks/{second.id}/reorder/",
+        {"target_task_id": str(first.id), "placement": "before"},
         format="json",
     )
     assert reorder.status_code == 200
-
-    after_reorder = client.get(
-        "/tasks/changes/",
-        {"cursor": cursor_before_reorder, "timeout_seconds": 0},
-    )
-    assert after_reorder.status_code == 200
-    assert after_reorder.data["changed"] is True
+    assert change_cursor(org.id) != cursor_before_reorder
 
 
 @pytest.mark.django_db
-def test_task_priority_is_optional_and_updatable():
-    org = Organization.objects.create(name="Priority Org")
-    user = User.objects.create_user(email="priority@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_task_priority_is_optional_and_updatable(shared_org, view_dispatch):
+    user = shared_org.member
 
-    create_res = client.post("/tasks/", {"title": "Priority Task", "area": "work", "priority": 5}, format="json")
+    create_res = _create_task(view_dispatch, user, {"title": "Priority Task", "area": "work", "priority": 5})
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
     assert create_res.data["priority"] == 5
 
-    update_res = client.patch(f"/tasks/{task_id}/", {"priority": 1}, format="json")
+    update_res = _patch_task(view_dispatch, user, task_id, {"priority": 1})
     assert update_res.status_code == 200
     assert update_res.data["priority"] == 1
 
-    clear_res = client.patch(f"/tasks/{task_id}/", {"priority": None}, format="json")
+    clear_res = _patch_task(view_dispatch, user, task_id, {"priority": None})
     assert clear_res.status_code == 200
     assert clear_res.data["priority"] is None
 
 
 @pytest.mark.django_db
-def test_tasks_accept_project_name_and_upsert_by_name():
-    org = Organization.objects.create(name="Project Name Org")
-    user = User.objects.create_user(email="project-name@example.com", password="StrongPass123!", organization=org)
+def test_tasks_accept_project_name_and_upsert_by_name(shared_org, view_dispatch):
+    org, user = shared_org.org, shared_org.member
     existing_project = Project.objects.create(organization=org, name="Launch Plan", area=Project.Area.WORK)
 
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    matched = client.post(
-        "/tasks/",
-        {"title": "Match existing project", "area": "work", "project": " launch plan "},
-        format="json",
+    matched = _create_task(
+        view_dispatch, user, {"title": "Match existing project", "area": "work", "project": " launch plan "}
     )
     assert matched.status_code == 201
     assert str(matched.data["project"]) == str(existing_project.id)
     assert Project.objects.filter(organization=org, name__iexact="launch plan").count() == 1
 
-    created = client.post(
-        "/tasks/",
-        {"title": "Create missing project", "area": "personal", "project": "Home Ops"},
-        format="json",
+    created = _create_task(
+        view_dispatch, user, {"title": "Create missing project", "area": "personal", "project": "Home Ops"}
     )
     assert created.status_code == 201
     created_task = Task.objects.get(id=created.data["id"])
@@ -329,11 +376,7 @@ def test_tasks_accept_project_name_and_upsert_by_name():
     assert created_task.project.name == "Home Ops"
     assert created_task.project.area == Project.Area.PERSONAL
 
-    patched = client.patch(
-        f"/tasks/{created_task.id}/",
-        {"project": "Errands"},
-        format="json",
-    )
+    patched = _patch_task(view_dispatch, user, created_task.id, {"project": "Errands"})
     assert patched.status_code == 200
     created_task.refresh_from_db()
     assert created_task.project is not None
@@ -341,53 +384,37 @@ def test_tasks_accept_project_name_and_upsert_by_name():
 
 
 @pytest.mark.django_db
-def test_recurring_task_requires_due_date():
-    org = Organization.objects.create(name="Recurring Validation Org")
-    user = User.objects.create_user(email="recurring-validation@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_recurring_task_requires_due_date(shared_org, view_dispatch):
+    user = shared_org.member
 
-    create_res = client.post(
-        "/tasks/",
-        {"title": "Recurring task", "area": "work", "recurrence": Task.Recurrence.WEEKLY},
-        format="json",
+    create_res = _create_task(
+        view_dispatch, user, {"title": "Recurring task", "area": "work", "recurrence": Task.Recurrence.WEEKLY}
     )
     assert create_res.status_code == 400
     assert "due_at" in create_res.data.get("details", {})
 
-    valid_create_res = client.post(
-        "/tasks/",
+    valid_create_res = _create_task(
+        view_dispatch,
+        user,
         {
             "title": "Recurring task with date",
             "area": "work",
             "recurrence": Task.Recurrence.WEEKLY,
             "due_at": (timezone.now() + timedelta(days=2)).isoformat(),
         },
-        format="json",
     )
     assert valid_create_res.status_code == 201
 
-    clear_due_res = client.patch(
-        f"/tasks/{valid_create_res.data['id']}/",
-        {"due_at": None},
-        format="json",
-    )
+    clear_due_res = _patch_task(view_dispatch, user, valid_create_res.data["id"], {"due_at": None})
     assert clear_due_res.status_code == 400
     assert "due_at" in clear_due_res.data.get("details", {})
 
 
 @pytest.mark.django_db
-def test_recurring_task_completion_creates_next_occurrence():
-    org = Organization.objects.create(name="Recurring Org")
-    user = User.objects.create_user(email="recurring@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_recurring_task_completion_creates_next_occurrence(shared_org, member_client):
+    org = shared_org.org
 
-    create_res = client.post(
+    create_res = member_client.post(
         "/tasks/",
         {
             "title": "Weekly report",
@@ -400,7 +427,7 @@ def test_recurring_task_completion_creates_next_occurrence():
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    complete_res = client.patch(f"/tasks/{task_id}/", {"status": "done"}, format="json")
+    complete_res = member_client.patch(f"/tasks/{task_id}/", {"status": "done"}, format="json")
     assert complete_res.status_code == 200
 
     old_task = Task.objects.get(id=task_id)
@@ -421,60 +448,57 @@ def test_recurring_task_completion_creates_next_occurrence():
 
 
 @pytest.mark.django_db
-def test_tasks_can_be_grouped_by_priority_then_manual_order():
-    org = Organization.objects.create(name="Priority Group Org")
-    user = User.objects.create_user(email="priority-group@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    t1 = client.post("/tasks/", {"title": "Low", "area": "work", "priority": 1}, format="json")
-    t2 = client.post("/tasks/", {"title": "High A", "area": "work", "priority": 5}, format="json")
-    t3 = client.post("/tasks/", {"title": "Medium", "area": "work", "priority": 3}, format="json")
-    t4 = client.post("/tasks/", {"title": "High B", "area": "work", "priority": 5}, format="json")
-    assert t1.status_code == 201
-    assert t2.status_code == 201
-    assert t3.status_code == 201
-    assert t4.status_code == 201
-
-    reorder = client.post(
-        f"/tasks/{t4.data['id']}/reorder/",
-        {"target_task_id": t2.data["id"], "placement": "before"},
+def test_tasks_can_be_grouped_by_priority_then_manual_order(shared_org, member_client, django_assert_max_num_queries):
+    org, user = shared_org.org, shared_org.member
+    t1, t2, t3, t4 = (
+        str(task.id)
+        for task in Task.objects.bulk_create(
+            [
+                Task(
+                    organization=org,
+                    created_by_user=user,
+                    title=title,
+                    area=Task.Area.WORK,
+                    priority=priority,
+                    # Contiguous, as rows created before gap spacing are: the move below has to renumber.
+                    position=index,
+                )
+                for index, (title, priority) in enumerate(
+                    [("Low", 1), ("High A", 5), ("Medium", 3), ("High B", 5)], start=1
+                )
+            ]
+        )
+    )
+
+    reorder = member_client.post(
+        f"/tasks/{t4}/reorder/",
+        {"target_task_id": t2, "placement": "before"},
         format="json",
     )
     assert reorder.status_code == 200
 
-    manual_list = client.get("/tasks/?page=1&page_size=50&sort=position&order=asc")
+    with django_assert_max_num_queries(4):
+        manual_list = member_client.get("/tasks/?page=1&page_size=50&sort=position&order=asc")
     assert manual_list.status_code == 200
     manual_ids = [item["id"] for item in manual_list.data["results"]]
-    assert manual_ids[:4] == [t1.data["id"], t4.data["id"], t2.data["id"], t3.data["id"]]
+    assert manual_ids[:4] == [t1, t4, t2, t3]
 
-    grouped_list = client.get("/tasks/?page=1&page_size=50&sort_mode=priority_manual")
+    with django_assert_max_num_queries(4):
+        grouped_list = member_client.get("/tasks/?page=1&page_size=50&sort_mode=priority_manual")
     assert grouped_list.status_code == 200
     grouped_ids = [item["id"] for item in grouped_list.data["results"]]
-    assert grouped_ids[:4] == [t4.data["id"], t2.data["id"], t3.data["id"], t1.data["id"]]
+    assert grouped_ids[:4] == [t4, t2, t3, t1]
 
 
 @pytest.mark.django_db
-def test_task_details_notes_and_org_scoped_attachments_can_be_saved_and_read():
-    org = Organization.objects.create(name="Details Org")
-    user = User.objects.create_user(email="details@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_task_details_notes_and_org_scoped_attachments_can_be_saved_and_read(shared_org, member_client, django_assert_max_num_queries):
+    org = shared_org.org
 
-    create_res = client.post("/tasks/", {"title": "With details", "area": "work"}, format="json")
+    create_res = member_client.post("/tasks/", {"title": "With details", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    uploaded = SimpleUploadedFile("details.txt", b"details attachment", content_type="text/plain")
-    upload_res = client.post(
-        f"/tasks/{task_id}/attachments/upload/",
-        {"file": uploaded},
-        format="multipart",
-    )
+    upload_res = _upload(member_client, task_id, "details.txt", b"details attachment")
     assert upload_res.status_code == 201
     assert len(upload_res.data["attachments"]) == 1
 
@@ -482,32 +506,26 @@ def test_task_details_notes_and_org_scoped_attachments_can_be_saved_and_read():
         "notes": "Email thread context and follow-up notes.",
         "attachments": upload_res.data["attachments"],
     }
-    patch_res = client.patch(f"/tasks/{task_id}/", payload, format="json")
+    patch_res = member_client.patch(f"/tasks/{task_id}/", payload, format="json")
     assert patch_res.status_code == 200
     assert patch_res.data["notes"] == payload["notes"]
     assert patch_res.data["attachments"][0]["name"] == "details.txt"
     assert patch_res.data["attachments"][0]["path"].startswith(f"tasks/{org.id}/{task_id}/")
 
-    detail_res = client.get(f"/tasks/{task_id}/")
+    with django_assert_max_num_queries(4):
+        detail_res = member_client.get(f"/tasks/{task_id}/")
     assert detail_res.status_code == 200
     assert detail_res.data["notes"] == payload["notes"]
     assert detail_res.data["attachments"][0]["path"] == patch_res.data["attachments"][0]["path"]
 
 
 @pytest.mark.django_db
-def test_task_details_reject_external_attachment_urls():
-    org = Organization.objects.create(name="Details Org")
-    user = User.objects.create_user(email="details@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    create_res = client.post("/tasks/", {"title": "With details", "area": "work"}, format="json")
+def test_task_details_reject_external_attachment_urls(member_client):
+    create_res = member_client.post("/tasks/", {"title": "With details", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    patch_res = client.patch(
+    patch_res = member_client.patch(
         f"/tasks/{task_id}/",
         {
             "attachments": [{"name": "malicious", "url": "https://evil.example/payload.html"}],
@@ -518,59 +536,37 @@ def test_task_details_reject_external_attachment_urls():
 
 
 @pytest.mark.django_db
-def test_task_attachment_file_upload_endpoint_appends_attachment():
-    org = Organization.objects.create(name="Upload Org")
-    user = User.objects.create_user(email="upload@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+def test_task_attachment_file_upload_endpoint_appends_attachment(shared_org, member_client):
+    org = shared_org.org
 
-    create_res = client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
+    create_res = member_client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    uploaded = SimpleUploadedFile("note.txt", b"hello task attachment", content_type="text/plain")
-    upload_res = client.post(
-        f"/tasks/{task_id}/attachments/upload/",
-        {"file": uploaded},
-        format="multipart",
-    )
+    upload_res = _upload(member_client, task_id)
     assert upload_res.status_code == 201
     assert len(upload_res.data["attachments"]) == 1
     assert upload_res.data["attachments"][0]["name"] == "note.txt"
     assert upload_res.data["attachments"][0]["path"].startswith(f"tasks/{org.id}/{task_id}/")
     assert upload_res.data["attachments"][0]["url"].startswith("/tasks/attachments/file?token=")
 
-    detail_res = client.get(f"/tasks/{task_id}/")
+    detail_res = member_client.get(f"/tasks/{task_id}/")
     assert detail_res.status_code == 200
     assert len(detail_res.data["attachments"]) == 1
 
     attachment_url = upload_res.data["attachments"][0]["url"]
-    download_res = client.get(attachment_url)
+    download_res = member_client.get(attachment_url)
     assert download_res.status_code == 200
-    assert b"hello task attachment" in b"".join(download_res.streaming_content)
+    assert _NOTE_BYTES in b"".join(download_res.streaming_content)
 
 
 @pytest.mark.django_db
-def test_task_attachment_file_requires_authenticated_user():
-    org = Organization.objects.create(name="Upload Org")
-    user = User.objects.create_user(email="upload-auth@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    create_res = client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
+def test_task_attachment_file_requires_authenticated_user(member_client):
+    create_res = member_client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    uploaded = SimpleUploadedFile("note.txt", b"hello task attachment", content_type="text/plain")
-    upload_res = client.post(
-        f"/tasks/{task_id}/attachments/upload/",
-        {"file": uploaded},
-        format="multipart",
-    )
+    upload_res = _upload(member_client, task_id)
     assert upload_res.status_code == 201
     attachment_url = upload_res.data["attachments"][0]["url"]
 
@@ -580,30 +576,14 @@ def test_task_attachment_file_requires_authenticated_user():
 
 
 @pytest.mark.django_db
-def test_task_attachment_file_denies_cross_org_access():
-    org_a = Organization.objects.create(name="Upload Org A")
-    user_a = User.objects.create_user(email="upload-org-a@example.com", password="StrongPass123!", organization=org_a)
-    org_b = Organization.objects.create(name="Upload Org B")
-    user_b = User.objects.create_user(email="upload-org-b@example.com", password="StrongPass123!", organization=org_b)
-
-    token_a = RefreshToken.for_user(user_a)
-    token_b = RefreshToken.for_user(user_b)
-
-    client_a = APIClient()
-    client_a.credentials(HTTP_AUTHORIZATION=f"Bearer {token_a.access_token}")
-    client_b = APIClient()
-    client_b.credentials(HTTP_AUTHORIZATION=f"Bearer {token_b.access_token}")
+def test_task_attachment_file_denies_cross_org_access(other_org, member_client, bearer_client):
+    client_b = bearer_client(other_org.member)
 
-    create_res = client_a.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
+    create_res = member_client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    uploaded = SimpleUploadedFile("note.txt", b"hello task attachment", content_type="text/plain")
-    upload_res = client_a.post(
-        f"/tasks/{task_id}/attachments/upload/",
-        {"file": uploaded},
-        format="multipart",
-    )
+    upload_res = _upload(member_client, task_id)
     assert upload_res.status_code == 201
     attachment_url = upload_res.data["attachments"][0]["url"]
 
@@ -612,22 +592,68 @@ def test_task_attachment_file_denies_cross_org_access():
 
 
 @pytest.mark.django_db
-def test_task_attachment_upload_rejects_active_content_extensions():
-    org = Organization.objects.create(name="Upload Org")
-    user = User.objects.create_user(email="upload@example.com", password="StrongPass123!", organization=org)
-
-    token = RefreshToken.for_user(user)
-    client = APIClient()
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
-
-    create_res = client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
+def test_task_attachment_upload_rejects_active_content_extensions(member_client):
+    create_res = member_client.post("/tasks/", {"title": "Upload task", "area": "work"}, format="json")
     assert create_res.status_code == 201
     task_id = create_res.data["id"]
 
-    uploaded = SimpleUploadedFile("payload.html", b"<script>alert(1)</script>", content_type="text/html")
-    upload_res = client.post(
-        f"/tasks/{task_id}/attachments/upload/",
-        {"file": uploaded},
-        format="multipart",
-    )
+    upload_res = _upload(member_client, task_id, "payload.html", b"<script>alert(1)</script>", content_type="text/html")
     assert upload_res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_tasks_list_filters_by_tag_name_case_insensitively(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+    tag = Tag.objects.create(organization=org, name="Site Visit")
+
+    tagged = Task.objects.create(organization=org, created_by_user=user, title="Tagged", area=Task.Area.WORK)
+    tagged.tags.set([tag])
+    Task.objects.create(organization=org, created_by_user=user, title="Untagged", area=Task.Area.WORK)
+
+    res = member_client.get("/tasks/?page=1&page_size=50&tag=site visit&with_total=true")
+    assert res.status_code == 200
+    assert res.data["total"] == 1
+    assert [item["id"] for item in res.data["results"]] == [str(tagged.id)]
+
+
+@pytest.mark.django_db
+def test_tasks_list_omits_long_text_fields_that_detail_returns(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+    task = Task.objects.create(
+        organization=org,
+        created_by_user=user,
+        title="Lean row",
+        description="Long body",
+        notes="Kept for inline details",
+        area=Task.Area.WORK,
+    )
+
+    listed = member_client.get("/tasks/?page=1&page_size=50")
+    assert listed.status_code == 200
+    row = listed.data["results"][0]
+    assert "description" not in row
+    assert row["notes"] == "Kept for inline details"
+    assert row["tag_ids"] == []
+
+    detail = member_client.get(f"/tasks/{task.id}/")
+    assert detail.status_code == 200
+    assert detail.data["description"] == "Long body"
+
+
+@pytest.mark.django_db
+def test_tasks_list_reports_has_next_and_counts_only_on_request(shared_org, member_client):
+    org, user = shared_org.org, shared_org.member
+    for index in range(3):
+        Task.objects.create(organization=org, created_by_user=user, title=f"Task {index}", area=Task.Area.WORK)
+
+    first = member_client.get("/tasks/?page=1&page_size=2")
+    assert first.status_code == 200
+    assert len(first.data["results"]) == 2
+    assert first.data["has_next"] is True
+    assert first.data["total"] is None
+
+    last = member_client.get("/tasks/?page=2&page_size=2&with_total=true")
+    assert last.status_code == 200
+    assert len(last.data["results"]) == 1
+    assert last.data["has_next"] is False
+    assert last.data["total"] == 3
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import copy
+import re
 from urllib.parse import parse_qs, urlparse
 
 import pytest
 from django.test import override_settings
 from rest_framework.test import APIClient
 
+from core import auth_views
 from core.models import User
 from mobile_api.models import OIDCIdentity
 
 
 class _FakeHTTPResponse:
-    def __init__(self, status_code: int, payload: dict):
+    def __init__(self, status_code: int, payload):
         self.status_code = status_code
         self._payload = payload
         self.text = ""
@@ -21,52 +24,89 @@ class _FakeHTTPResponse:
             raise RuntimeError(f"status={self.status_code}")
 
     def json(self):
-        return self._payload
+        # The views edit payloads in place before PUTting them back; keep the shared route table intact.
+        return copy.deepcopy(self._payload)
+
+
+_KEYCLOAK_ROUTES = tuple(
+    (method, re.compile(pattern), _FakeHTTPResponse(status_code, payload))
+    for method, pattern, status_code, payload in (
+        ("POST", r"/realms/master/protocol/openid-connect/token$", 200, {"access_token": "admin-token"}),
+        ("POST", r"/protocol/openid-connect/token$", 200, {"access_token": "fake-access-token"}),
+        (
+            "GET",
+            r"/protocol/openid-connect/userinfo$",
+            200,
+            {
+                "sub": "web-sub-1",
+                "email": "web-oidc@example.com",
+                "given_name": "Web",
+                "family_name": "User",
+            },
+        ),
+        ("POST", r"/admin/realms/taskhub/clients$", 201, {}),
+        ("GET", r"/admin/realms/taskhub/clients$", 200, []),
+        (
+            "GET",
+            r"/admin/realms/taskhub$",
+            200,
+            {
+                "registrationAllowed": False,
+                "registrationEmailAsUsername": False,
+                "loginWithEmailAllowed": False,
+            },
+        ),
+        ("PUT", r"/admin/realms/taskhub$", 204, {}),
+    )
+)
 
 
-class _Recorder:
+class _FakeKeycloak:
     def __init__(self):
         self.calls: list[tuple[str, str, dict]] = []
 
+    def _respond(self, method, url, kwargs):
+        self.calls.append((method, url, kwargs))
+        for route_method, pattern, response in _KEYCLOAK_ROUTES:
+            if route_method == method and pattern.search(url):
+                return response
+        raise AssertionError(f"Unexpected {method} {url}")
+
     def post(self, url, **kwargs):
-        self.calls.append(("POST", url, kwargs))
-        if url.endswith("/realms/master/protocol/openid-connect/token"):
-            return _FakeHTTPResponse(200, {"access_token": "admin-token"})
-        if url.endswith("/admin/realms/taskhub/clients"):
-            return _FakeHTTPResponse(201, {})
-        raise AssertionError(f"Unexpected POST {url}")
+        return self._respond("POST", url, kwargs)
 
     def get(self, url, **kwargs):
-        self.calls.append(("GET", url, kwargs))
-        if "/admin/realms/taskhub/clients" in url:
-            return _FakeHTTPResponse(200, [])
-        if url.endswith("/admin/realms/taskhub"):
-            return _FakeHTTPResponse(
-                200,
-                {
-                    "registrationAllowed": False,
-                    "registrationEmailAsUsername": False,
-                    "loginWithEmailAllowed": False,
-                },
-            )
-        raise AssertionError(f"Unexpected GET {url}")
+        return self._respond("GET", url, kwargs)
 
     def put(self, url, **kwargs):
-        self.calls.append(("PUT", url, kwargs))
-        if url.endswith("/admin/realms/taskhub"):
-            return _FakeHTTPResponse(204, {})
-        raise AssertionError(f"Unexpected PUT {url}")
+        return self._respond("PUT", url, kwargs)
 
 
-@pytest.mark.django_db
-@override_settings(
-    KEYCLOAK_WEB_AUTH_ENABLED=True,
-    KEYCLOAK_WEB_CLIENT_ID="taskhub-web",
-    KEYCLOAK_PUBLIC_BASE_URL="https://tasks.example.com",
-    KEYCLOAK_REALM="taskhub",
-    AUTH_COOKIE_SECURE=True,
-    KEYCLOAK_AUTO_BOOTSTRAP_WEB_CLIENT=False,
-)
+@pytest.fixture(autouse=True)
+def _oidc_settings(settings):
+    settings.KEYCLOAK_WEB_AUTH_ENABLED = True
+    settings.KEYCLOAK_WEB_CLIENT_ID = "taskhub-web"
+    settings.KEYCLOAK_PUBLIC_BASE_URL = "https://tasks.example.com"
+    settings.KEYCLOAK_REALM = "taskhub"
+    settings.KEYCLOAK_AUTO_BOOTSTRAP_WEB_CLIENT = False
+
+
+@pytest.fixture(autouse=True)
+def _reset_oidc_bootstrap():
+    # The start view bootstraps the Keycloak client once per process; let every test start fresh.
+    auth_views._OIDC_BOOTSTRAP_ONCE_KEYS.clear()
+    auth_views._OIDC_BOOTSTRAP_WARNED_KEYS.clear()
+
+
+@pytest.fixture
+def keycloak_http(monkeypatch):
+    fake = _FakeKeycloak()
+    for method in ("post", "get", "put"):
+        monkeypatch.setattr(auth_views.requests, method, getattr(fake, method))
+    return fake
+
+
+@override_settings(AUTH_COOKIE_SECURE=True)
 def test_web_oidc_start_redirect_sets_signed_flow_cookie():
     client = APIClient()
     response = client.get("/auth/oidc/start?next=/tasks")
@@ -83,15 +123,7 @@ def test_web_oidc_start_redirect_sets_signed_flow_cookie():
     assert query["code_challenge_method"][0] == "S256"
 
 
-@pytest.mark.django_db
-@override_settings(
-    KEYCLOAK_WEB_AUTH_ENABLED=True,
-    KEYCLOAK_WEB_CLIENT_ID="taskhub-web",
-    KEYCLOAK_PUBLIC_BASE_URL="https://tasks.example.com",
-    KEYCLOAK_REALM="taskhub",
-    KEYCLOAK_WEB_SIGNUP_ENABLED=True,
-    KEYCLOAK_AUTO_BOOTSTRAP_WEB_CLIENT=False,
-)
+@override_settings(KEYCLOAK_WEB_SIGNUP_ENABLED=True)
 def test_web_oidc_start_signup_sets_kc_action_register():
     client = APIClient()
     response = client.get("/auth/oidc/start?signup=1")
@@ -104,42 +136,16 @@ def test_web_oidc_start_signup_sets_kc_action_register():
 
 @pytest.mark.django_db
 @override_settings(
-    KEYCLOAK_WEB_AUTH_ENABLED=True,
-    KEYCLOAK_WEB_CLIENT_ID="taskhub-web",
-    KEYCLOAK_PUBLIC_BASE_URL="https://tasks.example.com",
-    KEYCLOAK_REALM="taskhub",
     KEYCLOAK_REQUIRED_AUDIENCE="taskhub-api",
     KEYCLOAK_AUTO_PROVISION_USERS=True,
     KEYCLOAK_AUTO_PROVISION_ORGANIZATION=True,
-    KEYCLOAK_AUTO_BOOTSTRAP_WEB_CLIENT=False,
 )
-def test_web_oidc_callback_creates_session_and_identity(monkeypatch):
-    from core import auth_views as auth_mod
-
+def test_web_oidc_callback_creates_session_and_identity(keycloak_http):
     client = APIClient()
     start = client.get("/auth/oidc/start?next=/")
     parsed = urlparse(start["Location"])
     state = parse_qs(parsed.query)["state"][0]
 
-    monkeypatch.setattr(
-        auth_mod.requests,
-        "post",
-        lambda *args, **kwargs: _FakeHTTPResponse(200, {"access_token": "fake-access-token"}),
-    )
-    monkeypatch.setattr(
-        auth_mod.requests,
-        "get",
-        lambda *args, **kwargs: _FakeHTTPResponse(
-            200,
-            {
-                "sub": "web-sub-1",
-                "email": "web-oidc@example.com",
-                "given_name": "Web",
-                "family_name": "User",
-            },
-        ),
-    )
-
     callback = client.get(f"/auth/oidc/callback?code=fake-code&state={state}")
     assert callback.status_code == 302
     assert callback["Location"] == "/"
@@ -157,7 +163,6 @@ def test_web_oidc_callback_creates_session_and_identity(monkeypatch):
     assert user.is_staff is True
 
 
-@pytest.mark.django_db
 @override_settings(KEYCLOAK_WEB_AUTH_ENABLED=False)
 def test_web_oidc_start_disabled_returns_404():
     client = APIClient()
@@ -165,12 +170,7 @@ def test_web_oidc_start_disabled_returns_404():
     assert response.status_code == 404
 
 
-@pytest.mark.django_db
 @override_settings(
-    KEYCLOAK_WEB_AUTH_ENABLED=True,
-    KEYCLOAK_WEB_CLIENT_ID="taskhub-web",
-    KEYCLOAK_PUBLIC_BASE_URL="https://tasks.example.com",
-    KEYCLOAK_REALM="taskhub",
     KEYCLOAK_WEB_SIGNUP_ENABLED=True,
     KEYCLOAK_AUTO_BOOTSTRAP_WEB_CLIENT=True,
     KEYCLOAK_BASE_URL="http://keycloak:8080/idp",
@@ -178,25 +178,16 @@ def test_web_oidc_start_disabled_returns_404():
     KEYCLOAK_ADMIN_USER="admin",
     KEYCLOAK_ADMIN_PASSWORD="admin",
 )
-def test_web_oidc_start_bootstraps_missing_keycloak_client(monkeypatch):
-    from core import auth_views as auth_mod
-
-    auth_mod._OIDC_BOOTSTRAP_ONCE_KEYS.clear()
-    auth_mod._OIDC_BOOTSTRAP_WARNED_KEYS.clear()
-    recorder = _Recorder()
-    monkeypatch.setattr(auth_mod.requests, "post", recorder.post)
-    monkeypatch.setattr(auth_mod.requests, "get", recorder.get)
-    monkeypatch.setattr(auth_mod.requests, "put", recorder.put)
-
+def test_web_oidc_start_bootstraps_missing_keycloak_client(keycloak_http):
     client = APIClient()
     response = client.get("/auth/oidc/start?signup=1")
     assert response.status_code == 302
     assert response["Location"].startswith("https://tasks.example.com/idp/realms/taskhub/protocol/openid-connect/auth?")
     assert any(
         method == "POST" and url.endswith("/admin/realms/taskhub/clients")
-        for method, url, _ in recorder.calls
+        for method, url, _ in keycloak_http.calls
     )
     assert any(
         method == "PUT" and url.endswith("/admin/realms/taskhub")
-        for method, url, _ in recorder.calls
+        for method, url, _ in keycloak_http.calls
     )
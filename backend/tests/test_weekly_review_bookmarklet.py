@@ -1,56 +1,53 @@
 from datetime import timedelta
 
 import pytest
+from django.urls import reverse
 from django.utils import timezone
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from ai.models import ReviewSummary
 from ai.tasks import weekly_review
-from core.models import Organization, User
 from tasks.models import Task
 
+pytestmark = pytest.mark.django_db(transaction=False, reset_sequences=False)
 
-@pytest.mark.django_db
-def test_weekly_review_job_persists_summary():
-    org = Organization.objects.create(name="Org")
-    user = User.objects.create_user(email="u@example.com", password="StrongPass123!", organization=org)
+BOOKMARKLET_PAYLOAD = {
+    "title": "Bookmark task",
+    "url": "https://example.com/page",
+    "snippet": "useful excerpt",
+    "area": "work",
+}
 
-    old_date = timezone.now() - timedelta(days=40)
-    task = Task.objects.create(
-        organization=org,
-        created_by_user=user,
-        title="Old next",
-        area=Task.Area.WORK,
-        status=Task.Status.NEXT,
-    )
-    Task.objects.filter(id=task.id).update(created_at=old_date)
-
-    result = weekly_review(str(org.id))
-    assert result["status"] == "ok"
-    assert ReviewSummary.objects.filter(organization=org).exists()
+
+@pytest.fixture(scope="module")
+def bookmarklet_url():
+    return reverse("capture_bookmarklet")
 
 
-@pytest.mark.django_db
-def test_bookmarklet_capture_endpoint_creates_task():
-    org = Organization.objects.create(name="Org")
-    user = User.objects.create_user(email="u@example.com", password="StrongPass123!", organization=org)
+def test_weekly_review_job_persists_summary(monkeypatch, shared_org):
+    org, user = shared_org.org, shared_org.member
+
+    old_date = timezone.now() - timedelta(days=40)
+    # created_at is auto_now_add; pin the clock so the single INSERT is already backdated.
+    with monkeypatch.context() as clock:
+        clock.setattr("django.utils.timezone.now", lambda: old_date)
+        Task.objects.create(
+            organization=org,
+            created_by_user=user,
+            title="Old next",
+            area=Task.Area.WORK,
+            status=Task.Status.NEXT,
+        )
+
+    # .run is the undecorated function body; no task request context is pushed.
+    result = weekly_review.run(str(org.id))
+    assert result["status"] == "ok"
+    summary = ReviewSummary.objects.values_list("content", flat=True).get(organization=org)
+    assert "next older than 30 days: 1" in summary
 
-    client = APIClient()
-    token = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
 
-    response = client.post(
-        "/capture/bookmarklet",
-        {
-            "title": "Bookmark task",
-            "url": "https://example.com/page",
-            "snippet": "useful excerpt",
-            "area": "work",
-        },
-        format="json",
-    )
+def test_bookmarklet_capture_endpoint_creates_task(member_client, bookmarklet_url):
+    response = member_client.post(bookmarklet_url, BOOKMARKLET_PAYLOAD, format="json")
 
     assert response.status_code == 201
-    assert response.data["title"] == "Bookmark task"
-    assert response.data["source_link"] == "https://example.com/page"
+    assert response.data["title"] == BOOKMARKLET_PAYLOAD["title"]
+    assert response.data["source_link"] == BOOKMARKLET_PAYLOAD["url"]
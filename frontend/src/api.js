@@ -191,6 +191,7 @@ export async function getTasks(token, params = {}) {
     page_size: '50',
     sort: 'position',
     order: 'asc',
+    with_total: 'true',
   })
   Object.entries(params).forEach(([key, value]) => {
     if (value === undefined || value === null || value === '') {
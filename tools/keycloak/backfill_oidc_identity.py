@@ -7,27 +7,51 @@ import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib encoder writes the same report, just slower on large runs.
+    orjson = None
+
+# Local-only fallbacks; anything already exported in the environment wins.
+DJANGO_ENV_DEFAULTS = {
+    "DJANGO_SETTINGS_MODULE": "config.settings",
+    "DJANGO_SECRET_KEY": "taskhub-backfill-script-local-only",
+    "TASKHUB_FIELD_ENCRYPTION_KEY": "taskhub-backfill-script-local-only",
+    "DJANGO_ALLOWED_HOSTS": "localhost,127.0.0.1,testserver",
+}
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
 def _configure_django() -> None:
-    root = _repo_root()
-    backend_dir = root / "backend"
-    if str(backend_dir) not in sys.path:
-        sys.path.insert(0, str(backend_dir))
+    import django
+    from django.apps import apps
 
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
-    os.environ.setdefault("DJANGO_SECRET_KEY", "taskhub-backfill-script-local-only")
-    os.environ.setdefault("TASKHUB_FIELD_ENCRYPTION_KEY", "taskhub-backfill-script-local-only")
-    os.environ.setdefault("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1,testserver")
+    # Already set up when main() runs again in-process or the script is imported from a configured project.
+    if apps.ready:
+        return
 
-    import django
+    backend_dir = str(_repo_root() / "backend")
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+
+    for name, value in DJANGO_ENV_DEFAULTS.items():
+        os.environ.setdefault(name, value)
 
     django.setup()
 
 
+def _render_report(report: dict, *, indent: bool) -> bytes:
+    # Key order is already fixed by how backfill_oidc_identities builds the report, so no sorting.
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 if indent else 0) + b"\n"
+    if indent:
+        return (json.dumps(report, indent=2) + "\n").encode("utf-8")
+    return (json.dumps(report, separators=(",", ":")) + "\n").encode("utf-8")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Backfill OIDCIdentity rows from a CSV mapping.")
     parser.add_argument("--csv", required=True, help="CSV path with columns: email,subject[,issuer]")
@@ -38,17 +62,18 @@ def main() -> int:
 
     _configure_django()
 
-    from mobile_api.backfill import backfill_oidc_identities, load_identity_mapping_csv
+    from mobile_api.backfill import backfill_oidc_identities, iter_identity_mapping_csv
 
-    rows = load_identity_mapping_csv(args.csv, default_issuer=args.issuer)
+    rows = iter_identity_mapping_csv(args.csv, default_issuer=args.issuer)
     report = backfill_oidc_identities(rows, dry_run=not args.apply)
     report["mode"] = "apply" if args.apply else "dry_run"
 
-    rendered = json.dumps(report, indent=2, sort_keys=True)
-    print(rendered)
+    # Compact on stdout for piping into other tools; the --report file stays indented for people.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_render_report(report, indent=False))
 
     if args.report:
-        Path(args.report).write_text(rendered + "\n", encoding="utf-8")
+        Path(args.report).write_bytes(_render_report(report, indent=True))
     return 0
 
 